@@ -1,3 +1,5 @@
 from .climate_controller import *
 from .climate_controller_v2 import *
-from .v3 import *
\ No newline at end of file
+from .v3 import *
+from .tiles import *
+from .health import *
\ No newline at end of file
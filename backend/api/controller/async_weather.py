@@ -0,0 +1,79 @@
+import asyncio
+
+from aiohttp import web
+
+from ..services import ClimateDataService, UpstreamUnavailable, async_upstream_client, climatology_cache
+from .climate_controller import (
+    NASA_POWER_BASE_URL, climatology_params, climatology_results, climatology_values, plan_climatology
+)
+
+# Async twins of the upstream-bound Flask routes, served by async_app.py
+async_weather_routes = web.RouteTableDef()
+async_climate_service = ClimateDataService()
+COORDINATE = r'-?\d+(?:\.\d+)?'
+
+
+def coordinate_args(request):
+    return float(request.match_info['lat']), float(request.match_info['lon'])
+
+
+@async_weather_routes.get(f'/weather/current/{{lat:{COORDINATE}}}/{{lon:{COORDINATE}}}')
+async def get_current_weather_async(request):
+    """Get current weather for specific coordinates"""
+    lat, lon = coordinate_args(request)
+    url = f"{async_climate_service.base_url}/forecast"
+    params = {'latitude': lat, 'longitude': lon, **async_climate_service.weather_params()}
+    try:
+        data = await async_upstream_client.get_json(url, params=params, timeout=10)
+    except UpstreamUnavailable as e:
+        return web.json_response({'error': str(e)}, status=503)
+    except Exception as e:
+        print(f"Error fetching weather data: {e}")
+        return web.json_response({'error': 'Failed to fetch weather data'}, status=500)
+    return web.json_response(data)
+
+
+@async_weather_routes.get(f'/weather/forecast/{{lat:{COORDINATE}}}/{{lon:{COORDINATE}}}')
+async def get_weather_forecast_async(request):
+    """Get weather forecast for specific coordinates"""
+    lat, lon = coordinate_args(request)
+    url = f"{async_climate_service.base_url}/forecast"
+    try:
+        data = await async_upstream_client.get_json(url, params=async_climate_service.forecast_params(lat, lon), timeout=10)
+        return web.json_response(data)
+    except UpstreamUnavailable as e:
+        return web.json_response({'error': str(e)}, status=503)
+    except Exception as e:
+        return web.json_response({'error': str(e)}, status=500)
+
+
+async def fetch_climatology_async(key, lat, lon, values, errors):
+    """Fetch one uncached climatology and write it back to the cache as soon as it arrives"""
+    try:
+        data = await async_upstream_client.get_json(NASA_POWER_BASE_URL, params=climatology_params(lat, lon), timeout=30)
+        values[key] = climatology_values(data)
+    except Exception as e:
+        errors[key] = e
+        return
+    await asyncio.to_thread(climatology_cache.put, key, values[key])
+
+
+@async_weather_routes.post('/get-climate-data-parallel')
+async def get_bulk_climate_data_parallel_async(request):
+    try:
+        body = await request.json()
+    except ValueError:
+        return web.json_response({"error": "Request body must be JSON"}, status=400)
+    coordinates = body.get('coordinates') if isinstance(body, dict) else None
+
+    if not coordinates:
+        return web.json_response({"error": "Coordinates array is required"}, status=400)
+
+    try:
+        # Every distinct miss is queued at once; the client's per-host cap bounds how many reach NASA POWER together
+        keys, values, misses = await asyncio.to_thread(plan_climatology, coordinates)
+        errors = {}
+        await asyncio.gather(*(fetch_climatology_async(key, lat, lon, values, errors) for key, (lat, lon) in misses.items()))
+        return web.json_response({"data": climatology_results(coordinates, keys, values, errors)})
+    except Exception as e:
+        return web.json_response({"error": str(e)}, status=500)
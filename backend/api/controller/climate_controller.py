@@ -1,83 +1,93 @@
-from flask import Blueprint, jsonify, request
-import requests
-import json
-from dotenv import load_dotenv
-import os
-import asyncio
-from concurrent.futures import ThreadPoolExecutor
-import aiohttp
+from ..services import climatology_cache
 
-
-climate_control_bp = Blueprint('climate_control_bp', __name__)
+# NASA POWER climatology helpers behind /get-climate-data-parallel, served by async_weather.py
 NASA_POWER_BASE_URL = "https://power.larc.nasa.gov/api/temporal/climatology/point"
+CLIMATOLOGY_PARAMETERS = "T2M,PRECTOTCORR,ALLSKY_SFC_SW_DWN,RH2M,WS2M"
+CLIMATOLOGY_START, CLIMATOLOGY_END = "2010", "2020"
+
+CLIMATOLOGY_UNITS = {
+    "temperature": "°C",
+    "precipitation": "mm/day",
+    "sunlight": "MJ/m²/day",
+    "humidity": "%",
+    "wind_speed": "m/s"
+}
+
+
+def climatology_params(lat, lon):
+    return {
+        "community": "AG",
+        "parameters": CLIMATOLOGY_PARAMETERS,
+        "latitude": lat,
+        "longitude": lon,
+        "start": CLIMATOLOGY_START,
+        "end": CLIMATOLOGY_END,
+        "format": "JSON"
+    }
+
+
+def climatology_values(data):
+    """Summarize a NASA POWER climatology response as annual means"""
+    props = data['properties']['parameter']
+    return {
+        "temperature": props["T2M"]["ANN"] if "ANN" in props["T2M"] else None,
+        "precipitation": props["PRECTOTCORR"]["ANN"] if "ANN" in props["PRECTOTCORR"] else None,
+        "sunlight": props["ALLSKY_SFC_SW_DWN"]["ANN"] if "ANN" in props["ALLSKY_SFC_SW_DWN"] else None,
+        "humidity": props["RH2M"]["ANN"] if "ANN" in props["RH2M"] else None,
+        "wind_speed": props["WS2M"]["ANN"] if "ANN" in props["WS2M"] else None
+    }
+
+
+def climatology_result(coord, values):
+    return {**values, "coordinates": coord, "units": CLIMATOLOGY_UNITS}
 
-@climate_control_bp.route('/get-climate-data-parallel', methods=['POST'])
-def get_bulk_climate_data_parallel():
-    coordinates = request.json.get('coordinates')
-    
-    if not coordinates:
-        return jsonify({"error": "Coordinates array is required"}), 400
-    
-    def fetch_climate_data(coord):
-        """Fetch climate data for a single coordinate"""
-        lat = coord['latitude']
-        lon = coord['longitude']
-        
-        params = {
-            "community": "AG",
-            "parameters": "T2M,PRECTOTCORR,ALLSKY_SFC_SW_DWN,RH2M,WS2M",
-            "latitude": lat,
-            "longitude": lon,
-            "start": "2010",
-            "end": "2020",
-            "format": "JSON"
-        }
-        
+
+def climatology_error(coord, error):
+    return {
+        "error": str(error),
+        "coordinates": coord,
+        "temperature": None,
+        "precipitation": None,
+        "sunlight": None,
+        "humidity": None,
+        "wind_speed": None,
+        "units": CLIMATOLOGY_UNITS
+    }
+
+
+def plan_climatology(coordinates):
+    """
+    Resolve each coordinate to its cache key and look the unique keys up in the climatology cache
+
+    Returns:
+        tuple: (keys, values, misses) where keys has one cache key per coordinate,
+            or the error raised for a malformed one, values maps cached keys to
+            their summaries and misses maps each uncached key to the snapped
+            (lat, lon) to fetch, once however often it repeats
+    """
+    keys = []
+    for coord in coordinates:
         try:
-            response = requests.get(NASA_POWER_BASE_URL, params=params, timeout=30)
-            response.raise_for_status()
-            data = response.json()
-            
-            props = data['properties']['parameter']
-            return {
-                "temperature": props["T2M"]["ANN"] if "ANN" in props["T2M"] else None,
-                "precipitation": props["PRECTOTCORR"]["ANN"] if "ANN" in props["PRECTOTCORR"] else None,
-                "sunlight": props["ALLSKY_SFC_SW_DWN"]["ANN"] if "ANN" in props["ALLSKY_SFC_SW_DWN"] else None,
-                "humidity": props["RH2M"]["ANN"] if "ANN" in props["RH2M"] else None,
-                "wind_speed": props["WS2M"]["ANN"] if "ANN" in props["WS2M"] else None,
-                "coordinates": coord,
-                "units": {
-                    "temperature": "°C",
-                    "precipitation": "mm/day",
-                    "sunlight": "MJ/m²/day",
-                    "humidity": "%",
-                    "wind_speed": "m/s"
-                }
-            }
+            keys.append(climatology_cache.key(coord['latitude'], coord['longitude'], CLIMATOLOGY_PARAMETERS,
+                                              f"{CLIMATOLOGY_START}-{CLIMATOLOGY_END}"))
         except Exception as e:
-            return {
-                "error": str(e),
-                "coordinates": coord,
-                "temperature": None,
-                "precipitation": None,
-                "sunlight": None,
-                "humidity": None,
-                "wind_speed": None,
-                "units": {
-                    "temperature": "°C",
-                    "precipitation": "mm/day",
-                    "sunlight": "MJ/m²/day",
-                    "humidity": "%",
-                    "wind_speed": "m/s"
-                }
-            }
-    
-    try:
-        # Use ThreadPoolExecutor for parallel requests
-        with ThreadPoolExecutor(max_workers=5) as executor:  # Limit concurrent requests
-            results = list(executor.map(fetch_climate_data, coordinates))
-        
-        return jsonify({"data": results}), 200
-
-    except Exception as e:
-        return jsonify({"error": str(e)}), 500
\ No newline at end of file
+            keys.append(e)
+    unique = {key: climatology_cache.snap(coord['latitude'], coord['longitude'])
+              for coord, key in zip(coordinates, keys) if not isinstance(key, Exception)}
+    values = climatology_cache.get_many(unique)
+    misses = {key: point for key, point in unique.items() if key not in values}
+    return keys, values, misses
+
+
+def climatology_results(coordinates, keys, values, errors):
+    """Build the per-coordinate response entries in request order"""
+    results = []
+    for coord, key in zip(coordinates, keys):
+        if isinstance(key, Exception):
+            results.append(climatology_error(coord, key))
+        elif key in values:
+            results.append(climatology_result(coord, values[key]))
+        else:
+            results.append(climatology_error(coord, errors[key]))
+    return results
+
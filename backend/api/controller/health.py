@@ -0,0 +1,41 @@
+from flask import Blueprint, jsonify
+from datetime import datetime
+import os
+
+from ..mongo.connection import pingMongo
+from ..services import local_grid_store
+
+bp_health = Blueprint('bp_health', __name__)
+READINESS_MONGO_TIMEOUT = float(os.getenv('READINESS_MONGO_TIMEOUT', 2))
+
+
+@bp_health.route('/health')
+def health_check():
+    """Liveness: the process is up and serving requests, without touching any dependency"""
+    return jsonify({'status': 'healthy', 'timestamp': datetime.now().isoformat()})
+
+
+@bp_health.route('/ready')
+def readiness_check():
+    """Readiness: the service can answer data requests from Mongo or the local grid store
+
+    Returns 200 when Mongo answers a ping, or when it does not but the local
+    grid store holds data to serve offline (reported as degraded), and 503
+    otherwise.
+    """
+    mongo = pingMongo(READINESS_MONGO_TIMEOUT)
+    local_days = {variable: len(days) for variable, days in local_grid_store.inventory().items()}
+
+    if mongo['ok']:
+        status, code = 'ready', 200
+    elif local_days:
+        status, code = 'degraded', 200
+    else:
+        status, code = 'unavailable', 503
+
+    return jsonify({
+        'status': status,
+        'timestamp': datetime.now().isoformat(),
+        'mongo': mongo,
+        'local_grid_store': local_days
+    }), code
@@ -0,0 +1,123 @@
+from flask import Blueprint, jsonify, request, send_file
+from collections import OrderedDict
+from datetime import datetime
+import threading
+import numpy as np
+import io
+from ..services import colormap_registry, interpolate_regular_grid, tile_count, tile_pixel_coordinates, TILE_SIZE, TILE_SCHEMES
+from .v3 import climate_service, CLIMATE_VARIABLES
+
+
+bp_tiles = Blueprint('bp_tiles', __name__)
+
+MAX_SOURCE_GRIDS = 8
+MAX_CACHED_TILES = 4096
+MAX_ZOOM = 12
+TILE_GRID_RESOLUTIONS = (1, 2, 5, 10)  # Degrees; each one is a separate cached source grid
+
+
+class ClimateTileCache:
+    """Daily source grids and rendered PNG tiles, both bounded with LRU eviction
+
+    Daily grids are generated with a seed derived from (date, resolution), so
+    a grid regenerated after eviction, or in another worker process, is
+    identical to the one earlier tiles were rendered from. Neighbouring tiles
+    therefore line up and share one color range whichever grid instance
+    rendered them.
+    """
+
+    def __init__(self, max_grids=MAX_SOURCE_GRIDS, max_tiles=MAX_CACHED_TILES):
+        self.max_grids = max_grids
+        self.max_tiles = max_tiles
+        self.grids = OrderedDict()
+        self.tiles = OrderedDict()
+        self.lock = threading.Lock()
+
+    def _get(self, store, key):
+        with self.lock:
+            value = store.get(key)
+            if value is not None:
+                store.move_to_end(key)
+            return value
+
+    def _put(self, store, key, value, limit):
+        with self.lock:
+            store[key] = value
+            store.move_to_end(key)
+            while len(store) > limit:
+                store.popitem(last=False)
+
+    def daily_grid(self, date, resolution):
+        key = (date, resolution)
+        grid = self._get(self.grids, key)
+        if grid is None:
+            grid = climate_service.generate_daily_global_grid(resolution, date, seed=(date.toordinal(), resolution))
+            self._put(self.grids, key, grid, self.max_grids)
+        return grid
+
+    def tile(self, key):
+        return self._get(self.tiles, key)
+
+    def store_tile(self, key, png_bytes):
+        self._put(self.tiles, key, png_bytes, self.max_tiles)
+
+
+tile_cache = ClimateTileCache()
+
+
+def render_climate_tile(grid, hour_index, variable, z, x, y, scheme, size=TILE_SIZE):
+    """Render one tile of a variable from a daily grid as PNG bytes"""
+    values = grid[variable][hour_index]
+    vmin, vmax = float(np.nanmin(values)), float(np.nanmax(values))
+
+    lats, lons = tile_pixel_coordinates(z, x, y, size, scheme)
+    tile_values = interpolate_regular_grid(grid['lat'], grid['lon'], values, lats, lons, method='linear')
+
+    # Normalize against the whole hour so every tile shares one color range
+    span = vmax - vmin if vmax > vmin else 1
+    img = colormap_registry.render((tile_values - vmin) / span, variable)
+
+    img_buffer = io.BytesIO()
+    img.save(img_buffer, format='PNG')
+    return img_buffer.getvalue()
+
+
+@bp_tiles.route('/tiles/<variable>/<timestamp>/<int:z>/<int:x>/<int:y>.png')
+def get_climate_tile(variable, timestamp, z, x, y):
+    """Render a single map tile of a climate variable at an hourly timestamp"""
+    try:
+        scheme = request.args.get('scheme', 'mercator')
+        try:
+            resolution = int(request.args.get('resolution', 5))
+        except ValueError:
+            resolution = None
+        if resolution not in TILE_GRID_RESOLUTIONS:
+            return jsonify({'error': f'Invalid resolution. Expected one of {TILE_GRID_RESOLUTIONS}'}), 400
+
+        if variable not in CLIMATE_VARIABLES:
+            return jsonify({'error': f'Unknown variable: {variable}'}), 404
+        if scheme not in TILE_SCHEMES:
+            return jsonify({'error': f'Unknown tiling scheme: {scheme}'}), 400
+
+        tiles_x, tiles_y = tile_count(z, scheme)
+        if z > MAX_ZOOM or not (0 <= x < tiles_x and 0 <= y < tiles_y):
+            return jsonify({'error': 'Tile out of range'}), 404
+
+        try:
+            moment = datetime.fromisoformat(timestamp)
+        except ValueError:
+            return jsonify({'error': 'Invalid timestamp. Expected ISO 8601 (e.g. 2025-05-25T13:00:00)'}), 400
+
+        key = (variable, moment.date(), moment.hour, resolution, scheme, z, x, y)
+        png_bytes = tile_cache.tile(key)
+        if png_bytes is None:
+            grid = tile_cache.daily_grid(moment.date(), resolution)
+            png_bytes = render_climate_tile(grid, moment.hour, variable, z, x, y, scheme)
+            tile_cache.store_tile(key, png_bytes)
+
+        response = send_file(io.BytesIO(png_bytes), mimetype='image/png')
+        response.headers['Cache-Control'] = 'public, max-age=3600'
+        return response
+
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
@@ -0,0 +1,113 @@
+"""
+Command line entry point for the Mongo ingestion and maintenance jobs
+
+Usage (from backend/):
+    python -m api.mongo.cli ping
+    python -m api.mongo.cli ensure-indexes
+    python -m api.mongo.cli dedupe-points
+    python -m api.mongo.cli ingest-nasa [--mode full|resume|incremental]
+    python -m api.mongo.cli ingest-openmeteo [--layout records|packed]
+    python -m api.mongo.cli migrate-grids --date 20250525
+    python -m api.mongo.cli sync-grid-store --all
+"""
+import argparse
+import sys
+
+from .connection import GRID_COLLECTION, WEATHER_COLLECTION, getCollection, pingMongo
+from .nasa_power_async import (
+    INGEST_MODES, NASA_POWER_CONCURRENCY, NASA_POWER_HOURLY_URL, NASA_POWER_RATE, NASA_POWER_RETRIES,
+    runNasaPowerIngest
+)
+from .weather_indexes import dedupeWeatherPoints, ensureGridIndexes, ensureIngestIndexes
+
+
+def runPing(args):
+    result = pingMongo()
+    print(result)
+    return 0 if result['ok'] else 1
+
+
+def runEnsureIndexes(args):
+    print(f"{WEATHER_COLLECTION}: {ensureIngestIndexes(getCollection(WEATHER_COLLECTION))}")
+    print(f"{GRID_COLLECTION}: {ensureGridIndexes(getCollection(GRID_COLLECTION))}")
+    return 0
+
+
+def runDedupePoints(args):
+    print(f"Deleted {dedupeWeatherPoints(getCollection(WEATHER_COLLECTION))} duplicate documents")
+    return 0
+
+
+def runIngestNasa(args):
+    stats = runNasaPowerIngest(mode=args.mode, resolution=args.resolution, days=args.days, start=args.start,
+                               end=args.end, concurrency=args.concurrency, rate=args.rate,
+                               base_url=args.base_url, retries=args.retries)
+    if stats['failed']:
+        print(f"{stats['failed']} points failed; rerun with --mode resume to fetch only those")
+    return 0 if stats['failed'] == 0 else 1
+
+
+def runIngestOpenMeteo(args):
+    from . import mongo_db_climate_data as openmeteo
+    openmeteo.createClimateData(args.layout)
+    print("Mongodb data insertion complete")
+    return 0
+
+
+def runMigrateGrids(args):
+    from .migrate_grid_documents import main
+    main(args.job_args)
+    return 0
+
+
+def runSyncGridStore(args):
+    from .sync_grid_store import main
+    main(args.job_args)
+    return 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m api.mongo.cli', description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    commands.add_parser('ping', help='Check that the Mongo cluster is reachable').set_defaults(run=runPing)
+    commands.add_parser('ensure-indexes', help='Create the read path indexes').set_defaults(run=runEnsureIndexes)
+
+    commands.add_parser('dedupe-points', help='Delete duplicate (lat, lon, timestamp) documents').set_defaults(
+        run=runDedupePoints)
+
+    nasa = commands.add_parser('ingest-nasa', help='Ingest NASA POWER hourly data')
+    nasa.add_argument('--mode', choices=INGEST_MODES, default='full',
+                      help='full: whole range; resume: cells missing from the manifest; incremental: only newer days')
+    nasa.add_argument('--start', help='YYYYMMDD first day (full and resume modes)')
+    nasa.add_argument('--end', help='YYYYMMDD last day, default today')
+    nasa.add_argument('--resolution', type=int, default=5, help='Grid spacing in degrees')
+    nasa.add_argument('--days', type=int, default=30, help='Number of trailing days to fetch')
+    nasa.add_argument('--concurrency', type=int, default=NASA_POWER_CONCURRENCY, help='Maximum requests in flight')
+    nasa.add_argument('--rate', type=float, default=NASA_POWER_RATE, help='Maximum requests per second')
+    nasa.add_argument('--retries', type=int, default=NASA_POWER_RETRIES, help='Retries per point')
+    nasa.add_argument('--base-url', default=NASA_POWER_HOURLY_URL, help='NASA POWER hourly point endpoint')
+    nasa.set_defaults(run=runIngestNasa)
+
+    openmeteo = commands.add_parser('ingest-openmeteo', help='Ingest Open-Meteo hourly data')
+    openmeteo.add_argument('--layout', choices=('records', 'packed'), default='records',
+                           help='records: one document per location and hour; packed: one per location')
+    openmeteo.set_defaults(run=runIngestOpenMeteo)
+
+    for name, run, help_text in [
+        ('migrate-grids', runMigrateGrids, 'Backfill grid documents, see migrate_grid_documents.py'),
+        ('sync-grid-store', runSyncGridStore, 'Fill the local grid store, see sync_grid_store.py'),
+    ]:
+        commands.add_parser(name, help=help_text, add_help=False).set_defaults(run=run, passthrough=True)
+
+    # Jobs with their own parser receive every argument after their name
+    args, job_args = parser.parse_known_args(argv)
+    if job_args and not getattr(args, 'passthrough', False):
+        parser.error(f"unrecognized arguments: {' '.join(job_args)}")
+    args.job_args = job_args
+    return args.run(args)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,131 @@
+from datetime import datetime, timedelta, timezone
+
+from pymongo import ASCENDING, UpdateOne
+
+from .weather_indexes import WEATHER_POINT_FILTER, WEATHER_POINT_INDEX_NAME
+
+
+class IngestManifest:
+    """Checkpoint manifest of completed ingestion cells, stored in Mongo next to the data
+
+    A cell is one grid point over one YYYYMMDD date range of one source. It is
+    recorded only after every document fetched for it has been written. Each
+    run first records a plan of the points it will fetch per range, so a run
+    that dies partway can be resumed by fetching the planned cells of every
+    range that are not recorded.
+    """
+
+    def __init__(self, collection, source='nasa_power'):
+        self.collection = collection
+        self.source = source
+
+    def ensureIndexes(self):
+        self.collection.create_index([("source", ASCENDING), ("start", ASCENDING), ("end", ASCENDING)])
+
+    def cellId(self, lat, lon, start, end):
+        return f"{self.source}:{lat}:{lon}:{start}:{end}"
+
+    def planId(self, start, end):
+        return f"{self.source}:plan:{start}:{end}"
+
+    def planRange(self, points, start, end):
+        """Record (lat, lon) points as planned for the start..end range, before any of them is fetched"""
+        if not points:
+            return
+        self.collection.update_one(
+            {"_id": self.planId(start, end)},
+            {"$set": {"source": self.source, "kind": "plan", "start": start, "end": end,
+                      "planned_at": datetime.now(timezone.utc), "done": False},
+             "$addToSet": {"points": {"$each": [[lat, lon] for lat, lon in points]}}},
+            upsert=True
+        )
+
+    def markCompleted(self, points, start, end):
+        """Record (lat, lon) points as completed for the start..end range"""
+        if not points:
+            return
+        now = datetime.now(timezone.utc)
+        self.collection.bulk_write([
+            UpdateOne(
+                {"_id": self.cellId(lat, lon, start, end)},
+                {"$set": {"source": self.source, "lat": lat, "lon": lon, "start": start, "end": end, "completed_at": now}},
+                upsert=True
+            )
+            for lat, lon in points
+        ], ordered=False)
+
+    def completedPoints(self, start, end):
+        """Return the set of (lat, lon) points completed for exactly the start..end range"""
+        cursor = self.collection.find({"source": self.source, "start": start, "end": end, "kind": {"$ne": "plan"}},
+                                      {"_id": 0, "lat": 1, "lon": 1})
+        return {(cell["lat"], cell["lon"]) for cell in cursor}
+
+    def plannedPoints(self, start, end):
+        """Return the (lat, lon) points planned for the start..end range, or None if it was never planned"""
+        plan = self.collection.find_one({"_id": self.planId(start, end)}, {"points": 1})
+        return [tuple(point) for point in plan["points"]] if plan else None
+
+    def pendingRanges(self):
+        """
+        Return the planned points without a completed cell, for every range not yet done
+
+        Ranges found complete are marked done so later resumes skip them.
+
+        Returns:
+            dict: {(start, end): [(lat, lon), ...]}
+        """
+        pending = {}
+        for plan in self.collection.find({"source": self.source, "kind": "plan", "done": {"$ne": True}}):
+            completed = self.completedPoints(plan["start"], plan["end"])
+            points = [tuple(point) for point in plan["points"] if tuple(point) not in completed]
+            if points:
+                pending[(plan["start"], plan["end"])] = points
+            else:
+                self.collection.update_one({"_id": plan["_id"]}, {"$set": {"done": True}})
+        return pending
+
+
+def latestStoredDates(collection, points=None):
+    """
+    Return {(lat, lon): YYYYMMDD of its newest stored hour} from the per-point collection
+
+    The $sort on the unique (lat, lon, timestamp) index lets the server answer
+    the $group/$last with an index scan instead of reading every document.
+    """
+    pipeline = [
+        {"$match": WEATHER_POINT_FILTER},  # Lets the partial unique index serve the scan
+        {"$sort": {"lat": 1, "lon": 1, "timestamp": 1}},
+        {"$group": {"_id": {"lat": "$lat", "lon": "$lon"}, "timestamp": {"$last": "$timestamp"}}}
+    ]
+    latest = {
+        (group["_id"]["lat"], group["_id"]["lon"]): group["timestamp"][:10].replace("-", "")
+        for group in collection.aggregate(pipeline, hint=WEATHER_POINT_INDEX_NAME, allowDiskUse=True)
+    }
+    if points is not None:
+        wanted = set(points)
+        latest = {point: date for point, date in latest.items() if point in wanted}
+    return latest
+
+
+def incrementalRanges(points, latest, end, days=30):
+    """
+    Group points by the first day they still need, up to end
+
+    A point re-fetches its newest stored day, which may have been partial, and
+    everything after it, so a daily refresh moves about one day per point; a
+    point with nothing stored, or only data older than the window, gets the
+    full trailing `days` window.
+
+    Returns:
+        dict: {(start, end): [(lat, lon), ...]}
+    """
+    end_date = datetime.strptime(end, "%Y%m%d")
+    full_start = (end_date - timedelta(days=days)).strftime("%Y%m%d")
+    ranges = {}
+    for point in points:
+        start = latest.get(tuple(point), full_start)
+        start = max(start, full_start)
+        if start > end:
+            continue
+        ranges.setdefault((start, end), []).append(tuple(point))
+    return ranges
@@ -0,0 +1,107 @@
+"""
+Backfill one packed grid document per timestamp from the per-point weather collection
+
+Usage (from backend/):
+    python -m api.mongo.migrate_grid_documents --date 20250525
+    python -m api.mongo.migrate_grid_documents --all --dry-run
+"""
+import argparse
+
+from pymongo import ReplaceOne
+
+from ..services.grid_document import CLIMATE_VARIABLES, encode_grid_document
+from .connection import GRID_COLLECTION, WEATHER_COLLECTION, getCollection
+from .weather_indexes import WEATHER_DATE_INDEX_KEYS, WEATHER_DATE_INDEX_NAME, ensureGridIndexes, ensureWeatherIndexes
+
+DELETE_BATCH_SIZE = 10000
+
+
+def groupDayByTimestamp(target_date, collection, variables, include_ids=False):
+    """Yield one {'_id': timestamp, 'lat': [...], 'lon': [...], variable: [...]} group per hour of a day
+
+    With include_ids each group also lists the '_ids' of its per-point documents.
+    """
+    group = {"_id": "$timestamp", "lat": {"$push": "$lat"}, "lon": {"$push": "$lon"}}
+    group.update({variable: {"$push": f"${variable}"} for variable in variables})
+    if include_ids:
+        group["_ids"] = {"$push": "$_id"}
+    pipeline = [
+        {"$match": {"date": target_date}},
+        {"$sort": dict(WEATHER_DATE_INDEX_KEYS)},
+        {"$group": group},
+        {"$sort": {"_id": 1}}
+    ]
+    return collection.aggregate(pipeline, hint=WEATHER_DATE_INDEX_NAME, allowDiskUse=True)
+
+
+def migrateDate(target_date, collection, grid_collection, variables, dry_run=False, delete_points=False):
+    """
+    Write the grid documents of one day, replacing any written by an earlier run
+
+    With delete_points, the per-point documents that were packed are deleted
+    once every grid document of the day is confirmed written. This requires
+    packing every climate variable, since the per-point documents hold all of
+    them. Documents added to the day after it was read are kept.
+
+    Returns:
+        int: Number of grid documents written (or that would be written on a dry run)
+
+    Raises:
+        ValueError: delete_points without every climate variable
+        RuntimeError: The write did not cover every grid document, nothing was deleted
+    """
+    if delete_points and not set(CLIMATE_VARIABLES) <= set(variables):
+        raise ValueError(f"Deleting per-point documents requires packing every variable: {CLIMATE_VARIABLES}")
+    operations = []
+    point_ids = []
+    for hour in groupDayByTimestamp(target_date, collection, variables, include_ids=delete_points):
+        columns = {variable: [value if value is not None else float('nan') for value in hour[variable]]
+                   for variable in variables}
+        document = encode_grid_document(target_date, hour["_id"], hour["lat"], hour["lon"], columns)
+        operations.append(ReplaceOne({"date": target_date, "timestamp": hour["_id"]}, document, upsert=True))
+        point_ids.extend(hour.get("_ids", []))
+
+    if operations and not dry_run:
+        result = grid_collection.bulk_write(operations, ordered=False)
+        written = result.upserted_count + result.matched_count
+        if written != len(operations):
+            raise RuntimeError(f"{target_date}: wrote {written} of {len(operations)} grid documents, kept the per-point documents")
+        for i in range(0, len(point_ids), DELETE_BATCH_SIZE):
+            collection.delete_many({"_id": {"$in": point_ids[i:i + DELETE_BATCH_SIZE]}})
+    return len(operations)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    dates = parser.add_mutually_exclusive_group(required=True)
+    dates.add_argument('--date', action='append', help='YYYYMMDD day to migrate, may be repeated')
+    dates.add_argument('--all', action='store_true', help='Migrate every day in the per-point collection')
+    parser.add_argument('--variables', nargs='+', default=CLIMATE_VARIABLES, help='Variables to pack')
+    parser.add_argument('--source', default=WEATHER_COLLECTION, help='Per-point collection to read')
+    parser.add_argument('--target', default=GRID_COLLECTION, help='Grid document collection to write')
+    parser.add_argument('--dry-run', action='store_true', help='Count the documents without writing them')
+    parser.add_argument('--delete-points', action='store_true',
+                        help='Delete the per-point documents of each day once its grid documents are written; '
+                             'requires every variable')
+    args = parser.parse_args(argv)
+    if args.delete_points and not set(CLIMATE_VARIABLES) <= set(args.variables):
+        parser.error(f"--delete-points requires every variable in --variables: {' '.join(CLIMATE_VARIABLES)}")
+
+    collection = getCollection(args.source)
+    grid_collection = getCollection(args.target)
+
+    ensureWeatherIndexes(collection)
+    ensureGridIndexes(grid_collection)
+
+    target_dates = sorted(collection.distinct("date")) if args.all else args.date
+    total = 0
+    for target_date in target_dates:
+        written = migrateDate(target_date, collection, grid_collection, args.variables,
+                              dry_run=args.dry_run, delete_points=args.delete_points)
+        total += written
+        print(f"{target_date}: {written} grid documents{' (dry run)' if args.dry_run else ''}")
+    print(f"Migrated {len(target_dates)} days, {total} grid documents")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,278 @@
+"""
+Concurrent, rate-limited ingestion of NASA POWER hourly data
+
+Grid points are fetched by a bounded pool of aiohttp workers that share a
+token-bucket rate limiter, retry transient failures with exponential backoff
+and full jitter, and hand parsed documents to a queue drained by a Mongo
+writer running in a thread, so network fetches and database writes overlap.
+"""
+import asyncio
+import os
+import random
+import time
+from datetime import datetime, timedelta
+
+import aiohttp
+
+from .climate_data_from_nasa_power_api import (
+    NASA_POWER_HOURLY_URL, NASA_POWER_PARAMETERS, buildWeatherDocuments, upsertWeatherDocuments
+)
+from .connection import INGEST_MANIFEST_COLLECTION, WEATHER_COLLECTION, getCollection
+from .ingest_manifest import IngestManifest, incrementalRanges, latestStoredDates
+from .weather_indexes import ensureIngestIndexes
+
+NASA_POWER_CONCURRENCY = int(os.getenv('NASA_POWER_CONCURRENCY', 8))
+NASA_POWER_RATE = float(os.getenv('NASA_POWER_RATE', 5))  # Requests per second across all workers
+NASA_POWER_TIMEOUT = float(os.getenv('NASA_POWER_TIMEOUT', 90))
+NASA_POWER_RETRIES = int(os.getenv('NASA_POWER_RETRIES', 5))
+RETRYABLE_STATUSES = {429, 500, 502, 503, 504}
+WRITE_BATCH_SIZE = 10000
+
+
+class TokenBucket:
+    """Async token bucket allowing `rate` acquisitions per second with bursts of up to `capacity`
+
+    The default capacity of one token spaces requests evenly, so no one-second
+    window ever sees more than `rate` of them.
+    """
+
+    def __init__(self, rate, capacity=None):
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else 1.0
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.lock = asyncio.Lock()
+
+    async def acquire(self):
+        # Waiters queue on the lock, so tokens are handed out in arrival order
+        async with self.lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+class RetryableStatus(Exception):
+    def __init__(self, status, retry_after=None):
+        super().__init__(f"HTTP {status}")
+        self.status = status
+        self.retry_after = retry_after
+
+
+def backoffDelay(attempt, base=1.0, cap=60.0):
+    """Exponential backoff with full jitter: a uniform delay in [0, min(cap, base * 2**attempt)]"""
+    return random.uniform(0, min(cap, base * 2 ** attempt))
+
+
+def nasaGridPoints(resolution=5, lat_start=25, lat_end=90, lon_start=-180, lon_end=180):
+    """List the (lat, lon) points of the ingestion grid, matching createClimateData's loops"""
+    return [(lat, lon)
+            for lat in range(lat_start, lat_end + 1, resolution)
+            for lon in range(lon_start, lon_end + 1, resolution)]
+
+
+def trailingDateRange(days=30, end_date=None):
+    """Return (start, end) YYYYMMDD strings covering the last `days` days"""
+    end_date = end_date or datetime.now()
+    start_date = end_date - timedelta(days=days)
+    return start_date.strftime("%Y%m%d"), end_date.strftime("%Y%m%d")
+
+
+async def fetchPoint(session, limiter, lat, lon, start, end, base_url=NASA_POWER_HOURLY_URL,
+                     retries=NASA_POWER_RETRIES, backoff_base=1.0):
+    """
+    Fetch one grid point, retrying timeouts, connection errors, 429 and 5xx responses
+
+    Every attempt takes a token from the limiter. A Retry-After header on a
+    429/503 response is honoured when it asks for a longer wait than the
+    backoff would.
+
+    Returns:
+        dict: The decoded JSON response
+    """
+    params = {
+        "latitude": lat,
+        "longitude": lon,
+        "community": "ag",
+        "parameters": NASA_POWER_PARAMETERS,
+        "start": start,
+        "end": end,
+        "format": "JSON"
+    }
+    for attempt in range(retries + 1):
+        await limiter.acquire()
+        try:
+            async with session.get(base_url, params=params) as response:
+                if response.status in RETRYABLE_STATUSES:
+                    retry_after = response.headers.get('Retry-After')
+                    raise RetryableStatus(response.status, float(retry_after) if retry_after and retry_after.isdigit() else None)
+                response.raise_for_status()
+                return await response.json(content_type=None)
+        except (RetryableStatus, aiohttp.ClientConnectionError, aiohttp.ClientPayloadError, asyncio.TimeoutError) as e:
+            if attempt == retries:
+                raise
+            delay = backoffDelay(attempt, backoff_base)
+            if isinstance(e, RetryableStatus) and e.retry_after is not None:
+                delay = max(delay, e.retry_after)
+            await asyncio.sleep(delay)
+
+
+async def mongoWriter(queue, write_batch, stats, on_point=None, batch_size=WRITE_BATCH_SIZE):
+    """
+    Drain (lat, lon, documents) items from the queue into batched writes until a None sentinel arrives
+
+    write_batch(documents, points) runs in a worker thread. Points are reported
+    through on_point only once their batch is written; a failed write marks
+    every point of its batch as failed instead of stopping the writer, so fetch
+    workers never block on a full queue.
+    """
+    batch, batch_points = [], []
+    while True:
+        item = await queue.get()
+        if item is not None:
+            lat, lon, documents = item
+            batch.extend(documents)
+            batch_points.append((lat, lon))
+        # Write when the batch is full, the queue has gone quiet or the run is over
+        if batch_points and (item is None or len(batch) >= batch_size or queue.empty()):
+            try:
+                await asyncio.to_thread(write_batch, batch, batch_points)
+                stats['documents'] += len(batch)
+                stats['written'] += len(batch_points)
+                error = None
+            except Exception as e:
+                print(f"Write of {len(batch_points)} points failed: {e}")
+                stats['failed'] += len(batch_points)
+                stats['failed_points'].extend(batch_points)
+                error = e
+            if on_point is not None:
+                for lat, lon in batch_points:
+                    on_point(lat, lon, error)
+            batch, batch_points = [], []
+        queue.task_done()
+        if item is None:
+            return
+
+
+async def ingestNasaPower(points, start, end, collection, concurrency=NASA_POWER_CONCURRENCY, rate=NASA_POWER_RATE,
+                          base_url=NASA_POWER_HOURLY_URL, timeout=NASA_POWER_TIMEOUT, retries=NASA_POWER_RETRIES,
+                          backoff_base=1.0, write=None, on_point=None, manifest=None):
+    """
+    Fetch every (lat, lon) point of a date range and write its hourly documents
+
+    Args:
+        points: (lat, lon) pairs to fetch
+        start, end (str): YYYYMMDD date range
+        collection: Collection receiving the per-point documents
+        concurrency (int): Maximum requests in flight
+        rate (float): Maximum requests started per second, retries included
+        base_url (str): NASA POWER hourly point endpoint, or a local stand-in
+        write: Optional callable(documents) replacing the (lat, lon, timestamp) upserts
+        on_point: Optional callable(lat, lon, error) called once per point after its
+            documents are written (error None) or once its fetch or write failed
+        manifest: Optional IngestManifest recording each written point as a completed cell
+
+    Returns:
+        dict: Counts of fetched, written and failed points and written documents, plus the failed points
+    """
+    write = write or (lambda documents: upsertWeatherDocuments(collection, documents))
+
+    def write_batch(documents, written_points):
+        if documents:
+            write(documents)
+        if manifest is not None:
+            manifest.markCompleted(written_points, start, end)
+
+    limiter = TokenBucket(rate)
+    queue = asyncio.Queue(maxsize=concurrency * 2)  # Backpressure when Mongo falls behind
+    stats = {'points': len(points), 'fetched': 0, 'written': 0, 'failed': 0, 'documents': 0, 'failed_points': []}
+    pending = list(reversed(points))
+    started = time.monotonic()
+
+    async def worker(session):
+        while pending:
+            lat, lon = pending.pop()
+            try:
+                data = await fetchPoint(session, limiter, lat, lon, start, end, base_url, retries, backoff_base)
+                documents = buildWeatherDocuments(data, lat, lon)
+            except Exception as e:
+                print(f"Error for lat={lat}, lon={lon}: {e}")
+                stats['failed'] += 1
+                stats['failed_points'].append((lat, lon))
+                if on_point is not None:
+                    on_point(lat, lon, e)
+                continue
+            await queue.put((lat, lon, documents))
+            stats['fetched'] += 1
+            if stats['fetched'] % 50 == 0:
+                print(f"Fetched {stats['fetched']}/{len(points)} points in {(time.monotonic() - started) / 60:.1f} minutes")
+
+    connector = aiohttp.TCPConnector(limit=concurrency)
+    async with aiohttp.ClientSession(connector=connector, timeout=aiohttp.ClientTimeout(total=timeout)) as session:
+        writer = asyncio.create_task(mongoWriter(queue, write_batch, stats, on_point))
+        await asyncio.gather(*(worker(session) for _ in range(min(concurrency, len(points)) or 1)))
+        await queue.put(None)
+        await writer
+    print(f"Wrote {stats['written']}/{len(points)} points ({stats['documents']} documents), "
+          f"{stats['failed']} failed, in {(time.monotonic() - started) / 60:.1f} minutes")
+    return stats
+
+
+INGEST_MODES = ('full', 'resume', 'incremental')
+
+
+def runNasaPowerIngest(mode='full', resolution=5, days=30, start=None, end=None, **kwargs):
+    """
+    Synchronous entry point for ingesting the ingestion grid
+
+    Modes:
+        full: fetch start..end (default: the trailing `days` days) for every point
+        resume: fetch the planned points without a completed cell in the
+            manifest, for every unfinished range or only for start..end
+        incremental: fetch each point from its newest stored day up to end
+
+    Returns:
+        dict: Stats summed over every range fetched
+    """
+    if mode not in INGEST_MODES:
+        raise ValueError(f"Unknown ingest mode '{mode}'. Expected one of {INGEST_MODES}.")
+    collection = getCollection(WEATHER_COLLECTION)
+    ensureIngestIndexes(collection)
+    manifest = IngestManifest(getCollection(INGEST_MANIFEST_COLLECTION))
+    manifest.ensureIndexes()
+
+    points = nasaGridPoints(resolution)
+    default_start, default_end = trailingDateRange(days)
+    end = end or default_end
+
+    if mode == 'full':
+        ranges = {(start or default_start, end): points}
+    elif mode == 'resume':
+        if start is None:
+            ranges = manifest.pendingRanges()
+            if not ranges:
+                print("resume: every planned range is complete")
+        else:
+            completed = manifest.completedPoints(start, end)
+            planned = manifest.plannedPoints(start, end) or points
+            ranges = {(start, end): [point for point in planned if point not in completed]}
+    else:
+        ranges = incrementalRanges(points, latestStoredDates(collection, points), end, days)
+
+    if mode != 'resume':
+        for (range_start, range_end), range_points in ranges.items():
+            manifest.planRange(range_points, range_start, range_end)
+
+    total = {'points': 0, 'fetched': 0, 'written': 0, 'failed': 0, 'documents': 0, 'failed_points': []}
+    for (range_start, range_end), range_points in sorted(ranges.items()):
+        print(f"{mode}: {len(range_points)} points for {range_start}..{range_end}")
+        if not range_points:
+            continue
+        stats = asyncio.run(ingestNasaPower(range_points, range_start, range_end, collection, manifest=manifest, **kwargs))
+        for key, value in stats.items():
+            total[key] += value
+    return total
@@ -0,0 +1,93 @@
+"""
+Fill the local memory-mapped grid store from the Mongo weather collections
+
+Days are read from the grid document collection when it holds them and from
+the per-point collection otherwise, then written as one (24, lat, lon) file
+per variable and day.
+
+Usage (from backend/):
+    python -m api.mongo.sync_grid_store --date 20250525
+    python -m api.mongo.sync_grid_store --all --variables temperature humidity
+"""
+import argparse
+import os
+from datetime import datetime
+
+from ..services.grid_document import CLIMATE_VARIABLES, decode_grid_document
+from ..services.grid_store import LocalGridStore, DEFAULT_GRID_STORE_DIR
+from .connection import GRID_COLLECTION, WEATHER_COLLECTION, getCollection
+from .migrate_grid_documents import groupDayByTimestamp
+from .weather_indexes import GRID_DATE_INDEX_NAME, ensureGridIndexes, ensureWeatherIndexes
+
+
+def fetchDay(target_date, collection, grid_collection, variables):
+    """
+    Fetch every variable of a day, preferring grid documents over per-point documents
+
+    Returns:
+        dict: {variable: {hour: (timestamp, point data)}}
+    """
+    days = {variable: {} for variable in variables}
+    grid_documents = list(grid_collection.find({"date": target_date}).hint(GRID_DATE_INDEX_NAME))
+    if grid_documents:
+        for document in grid_documents:
+            hour = datetime.fromisoformat(document["timestamp"]).hour
+            for variable in variables:
+                data = decode_grid_document(document, variable)
+                if data is not None:
+                    days[variable][hour] = (document["timestamp"], data)
+        return days
+
+    for group in groupDayByTimestamp(target_date, collection, variables):
+        hour = datetime.fromisoformat(group["_id"]).hour
+        for variable in variables:
+            column = [value if value is not None else float('nan') for value in group[variable]]
+            days[variable][hour] = (group["_id"], {'lat': group["lat"], 'lon': group["lon"], variable: column})
+    return days
+
+
+def syncDate(target_date, collection, grid_collection, store, variables):
+    """
+    Write one day of every variable to the local grid store
+
+    Returns:
+        dict: {variable: stored shape} for the variables that had data
+    """
+    written = {}
+    for variable, hours in fetchDay(target_date, collection, grid_collection, variables).items():
+        if hours:
+            written[variable] = store.write_day(variable, target_date, hours)
+    return written
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    dates = parser.add_mutually_exclusive_group(required=True)
+    dates.add_argument('--date', action='append', help='YYYYMMDD day to sync, may be repeated')
+    dates.add_argument('--all', action='store_true', help='Sync every day found in either collection')
+    parser.add_argument('--variables', nargs='+', default=CLIMATE_VARIABLES, help='Variables to sync')
+    parser.add_argument('--store', default=os.getenv('GRID_STORE_DIR', DEFAULT_GRID_STORE_DIR),
+                        help='Local grid store directory')
+    args = parser.parse_args(argv)
+
+    collection = getCollection(WEATHER_COLLECTION)
+    grid_collection = getCollection(GRID_COLLECTION)
+
+    ensureWeatherIndexes(collection)
+    ensureGridIndexes(grid_collection)
+
+    if args.all:
+        target_dates = sorted(set(collection.distinct("date")) | set(grid_collection.distinct("date")))
+    else:
+        target_dates = args.date
+
+    store = LocalGridStore(args.store)
+    for target_date in target_dates:
+        written = syncDate(target_date, collection, grid_collection, store, args.variables)
+        shapes = ', '.join(f"{variable} {shape}" for variable, shape in written.items()) or 'no data'
+        print(f"{target_date}: {shapes}")
+    print(f"Synced {len(target_dates)} days into {args.store}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,88 @@
+from pymongo import ASCENDING
+from pymongo.errors import OperationFailure
+
+# Compound B-tree index serving day and hour lookups on the per-point weather schema
+WEATHER_DATE_INDEX_NAME = "date_timestamp_lat_lon"
+WEATHER_DATE_INDEX_KEYS = [("date", ASCENDING), ("timestamp", ASCENDING), ("lat", ASCENDING), ("lon", ASCENDING)]
+
+# Unique key of a per-point document, so re-ingesting an hour updates it instead of duplicating it
+WEATHER_POINT_INDEX_NAME = "lat_lon_timestamp_unique"
+WEATHER_POINT_INDEX_KEYS = [("lat", ASCENDING), ("lon", ASCENDING), ("timestamp", ASCENDING)]
+# Open-Meteo records in the same collection use latitude/longitude/datetime, so the key only covers per-point documents
+WEATHER_POINT_FILTER = {"timestamp": {"$exists": True}}
+
+
+def ensureWeatherIndexes(collection):
+    """
+    Create the indexes the heatmap read path relies on, if they are missing
+
+    Args:
+        collection: The weather collection holding per-point documents
+
+    Returns:
+        str: Name of the (date, timestamp, lat, lon) index
+    """
+    return collection.create_index(WEATHER_DATE_INDEX_KEYS, name=WEATHER_DATE_INDEX_NAME)
+
+
+def ensureIngestIndexes(collection):
+    """
+    Create the read path index and the unique (lat, lon, timestamp) key ingestion upserts on
+
+    Raises:
+        RuntimeError: When the collection already holds duplicate hours, which
+            'python -m api.mongo.cli dedupe-points' removes
+    """
+    ensureWeatherIndexes(collection)
+    try:
+        return collection.create_index(WEATHER_POINT_INDEX_KEYS, name=WEATHER_POINT_INDEX_NAME, unique=True,
+                                       partialFilterExpression=WEATHER_POINT_FILTER)
+    except OperationFailure as e:
+        if e.code == 11000:
+            raise RuntimeError(
+                f"{collection.name} holds duplicate (lat, lon, timestamp) documents; "
+                "run 'python -m api.mongo.cli dedupe-points' first"
+            ) from e
+        raise
+
+
+def dedupeWeatherPoints(collection):
+    """
+    Delete all but one per-point document of every duplicated (lat, lon, timestamp)
+
+    Returns:
+        int: Number of documents deleted
+    """
+    pipeline = [
+        {"$match": WEATHER_POINT_FILTER},
+        {"$group": {"_id": {"lat": "$lat", "lon": "$lon", "timestamp": "$timestamp"},
+                    "ids": {"$push": "$_id"}, "count": {"$sum": 1}}},
+        {"$match": {"count": {"$gt": 1}}}
+    ]
+    deleted = 0
+    for group in collection.aggregate(pipeline, allowDiskUse=True):
+        deleted += collection.delete_many({"_id": {"$in": group["ids"][1:]}}).deleted_count
+    return deleted
+
+
+def timestampDate(timestamp):
+    """Return the YYYYMMDD date key of an ISO timestamp such as 2025-05-25T13:00:00+00:00"""
+    return timestamp[:10].replace("-", "")
+
+
+# One grid document per timestamp, looked up by day or by hour
+GRID_DATE_INDEX_NAME = "date_timestamp"
+GRID_DATE_INDEX_KEYS = [("date", ASCENDING), ("timestamp", ASCENDING)]
+
+
+def ensureGridIndexes(collection):
+    """
+    Create the unique (date, timestamp) index of the grid document collection
+
+    Args:
+        collection: The collection holding one grid document per timestamp
+
+    Returns:
+        str: Name of the (date, timestamp) index
+    """
+    return collection.create_index(GRID_DATE_INDEX_KEYS, name=GRID_DATE_INDEX_NAME, unique=True)
@@ -1 +1,13 @@
-from .climate_data_service import *
\ No newline at end of file
+from .climate_data_service import *
+from .colormap_service import *
+from .interpolation_service import *
+from .tile_service import *
+from .frame_cache import *
+from .frame_store import *
+from .render_executor import *
+from .grid_codec import *
+from .grid_document import *
+from .grid_store import *
+from .openmeteo_batch import *
+from .upstream_client import *
+from .climatology_cache import *
\ No newline at end of file
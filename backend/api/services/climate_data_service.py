@@ -1,63 +1,99 @@
 
 from flask import Flask, jsonify, request
 from flask_cors import CORS
-import requests
 import numpy as np
 from datetime import datetime, timedelta
 import json
 import math
 
+from .openmeteo_batch import chunk_locations, grid_locations, location_params, split_json_locations
+from .upstream_client import upstream_client
+
 class ClimateDataService:
     def __init__(self):
         self.base_url = "https://api.open-meteo.com/v1"
         
+    def weather_params(self):
+        """Query parameters shared by single and multi-location weather requests"""
+        return {
+            'current': 'temperature_2m,relative_humidity_2m,wind_speed_10m,precipitation',
+            'hourly': 'temperature_2m,relative_humidity_2m,wind_speed_10m,wind_direction_10m,precipitation,shortwave_radiation',
+            'timezone': 'auto',
+            'forecast_days': 1
+        }
+
+    def forecast_params(self, lat, lon):
+        """Query parameters of the 7 day hourly forecast for one location"""
+        return {
+            'latitude': lat,
+            'longitude': lon,
+            'hourly': 'temperature_2m,relative_humidity_2m,wind_speed_10m,wind_direction_10m,precipitation,shortwave_radiation',
+            'timezone': 'auto',
+            'forecast_days': 7
+        }
+
     def get_weather_data(self, lat, lon):
         """Get current weather data for a specific location"""
         try:
             url = f"{self.base_url}/forecast"
-            params = {
-                'latitude': lat,
-                'longitude': lon,
-                'current': 'temperature_2m,relative_humidity_2m,wind_speed_10m,precipitation',
-                'hourly': 'temperature_2m,relative_humidity_2m,wind_speed_10m,wind_direction_10m,precipitation,shortwave_radiation',
-                'timezone': 'auto',
-                'forecast_days': 1
-            }
+            params = {'latitude': lat, 'longitude': lon, **self.weather_params()}
             
-            response = requests.get(url, params=params, timeout=10)
+            response = upstream_client.get(url, params=params, timeout=10)
             response.raise_for_status()
             return response.json()
         except Exception as e:
             print(f"Error fetching weather data: {e}")
             return None
+
+    def get_weather_data_batch(self, chunk):
+        """Get current weather data for a chunk of (lat, lon) locations in one request
+
+        Returns:
+            list: (location, data) pairs in request order, or an empty list if the request failed
+        """
+        try:
+            url = f"{self.base_url}/forecast"
+            params = {**location_params(chunk), **self.weather_params()}
+
+            response = upstream_client.get(url, params=params, timeout=30)
+            response.raise_for_status()
+            return split_json_locations(chunk, response.json())
+        except Exception as e:
+            print(f"Error fetching weather data for {len(chunk)} locations: {e}")
+            return []
+
+    def weather_point(self, lat, lon, data):
+        """Summarize one location's weather response as a grid point, or None without current data"""
+        if not data or 'current' not in data:
+            return None
+        current = data['current']
+        hourly = data.get('hourly', {})
+        
+        # Calculate average sunlight (shortwave radiation)
+        sunlight = 0
+        if 'shortwave_radiation' in hourly and hourly['shortwave_radiation']:
+            valid_radiation = [r for r in hourly['shortwave_radiation'] if r is not None]
+            sunlight = sum(valid_radiation) / len(valid_radiation) if valid_radiation else 0
+        
+        return {
+            'lat': lat,
+            'lon': lon,
+            'temperature': current.get('temperature_2m', 0),
+            'humidity': current.get('relative_humidity_2m', 0),
+            'windSpeed': current.get('wind_speed_10m', 0),
+            'precipitation': current.get('precipitation', 0),
+            'sunlight': sunlight
+        }
     
     def get_global_weather_grid(self, resolution=5):
-        """Get weather data for a global grid"""
+        """Get weather data for a global grid, requesting up to OPENMETEO_MAX_LOCATIONS cells per call"""
         weather_grid = []
         
         # Create a grid with specified resolution (degrees)
-        for lat in range(-90, 91, resolution):
-            for lon in range(-180, 181, resolution):
-                data = self.get_weather_data(lat, lon)
-                if data and 'current' in data:
-                    current = data['current']
-                    hourly = data.get('hourly', {})
-                    
-                    # Calculate average sunlight (shortwave radiation)
-                    sunlight = 0
-                    if 'shortwave_radiation' in hourly and hourly['shortwave_radiation']:
-                        valid_radiation = [r for r in hourly['shortwave_radiation'] if r is not None]
-                        sunlight = sum(valid_radiation) / len(valid_radiation) if valid_radiation else 0
-                    
-                    weather_point = {
-                        'lat': lat,
-                        'lon': lon,
-                        'temperature': current.get('temperature_2m', 0),
-                        'humidity': current.get('relative_humidity_2m', 0),
-                        'windSpeed': current.get('wind_speed_10m', 0),
-                        'precipitation': current.get('precipitation', 0),
-                        'sunlight': sunlight
-                    }
+        for chunk in chunk_locations(grid_locations(resolution)):
+            for (lat, lon), data in self.get_weather_data_batch(chunk):
+                weather_point = self.weather_point(lat, lon, data)
+                if weather_point is not None:
                     weather_grid.append(weather_point)
         
         return weather_grid
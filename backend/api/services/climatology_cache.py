@@ -0,0 +1,93 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+
+from .frame_store import BACKEND_DIR
+
+DEFAULT_CLIMATOLOGY_CACHE_PATH = os.path.join(BACKEND_DIR, '.climatology_cache.sqlite3')
+DEFAULT_CLIMATOLOGY_CACHE_PRECISION = 2  # 0.01° is far finer than the NASA POWER grid
+SQLITE_MAX_VARIABLES = 500
+
+
+class ClimatologyCache:
+    """Persistent key-value cache of climatology summaries, shared by worker processes
+
+    Climatologies over a fixed period never change, so entries have no
+    expiry. Keys combine the coordinates snapped to ``precision`` decimals
+    with the parameter set and period, and values are JSON. The SQLite file
+    runs in WAL mode so readers do not block the writer. Each thread opens
+    its own connection on first use, and a forked worker reconnects. The
+    cache is best effort: database errors are logged and read as misses.
+    """
+
+    def __init__(self, path=DEFAULT_CLIMATOLOGY_CACHE_PATH, precision=DEFAULT_CLIMATOLOGY_CACHE_PRECISION):
+        self.path = path
+        self.precision = precision
+        self.local = threading.local()
+        self.hits = 0
+        self.misses = 0
+
+    def _connect(self):
+        connection = getattr(self.local, 'connection', None)
+        if connection is not None and self.local.pid == os.getpid():
+            return connection
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        connection = sqlite3.connect(self.path, timeout=30)
+        connection.execute('PRAGMA journal_mode=WAL')
+        connection.execute('CREATE TABLE IF NOT EXISTS climatology (key TEXT PRIMARY KEY, value TEXT NOT NULL, created_at REAL NOT NULL)')
+        connection.commit()
+        self.local.connection, self.local.pid = connection, os.getpid()
+        return connection
+
+    def snap(self, lat, lon):
+        """Round coordinates to the cache precision; the snapped point is what gets fetched"""
+        return round(float(lat), self.precision), round(float(lon), self.precision)
+
+    def key(self, lat, lon, parameters, period):
+        lat, lon = self.snap(lat, lon)
+        return f"{lat:.{self.precision}f}:{lon:.{self.precision}f}:{parameters}:{period}"
+
+    def get_many(self, keys):
+        """Return {key: value} for the cached subset of keys"""
+        keys = list(dict.fromkeys(keys))
+        found = {}
+        try:
+            connection = self._connect()
+            for i in range(0, len(keys), SQLITE_MAX_VARIABLES):
+                batch = keys[i:i + SQLITE_MAX_VARIABLES]
+                rows = connection.execute(
+                    f"SELECT key, value FROM climatology WHERE key IN ({','.join('?' * len(batch))})", batch
+                )
+                found.update((key, json.loads(value)) for key, value in rows)
+        except sqlite3.Error as e:
+            print(f"Climatology cache read failed: {e}")
+        self.hits += len(found)
+        self.misses += len(keys) - len(found)
+        return found
+
+    def put(self, key, value):
+        try:
+            connection = self._connect()
+            with connection:
+                connection.execute('INSERT OR REPLACE INTO climatology (key, value, created_at) VALUES (?, ?, ?)',
+                                   (key, json.dumps(value), time.time()))
+        except sqlite3.Error as e:
+            print(f"Climatology cache write failed: {e}")
+
+    def stats(self):
+        """Return hit/miss counters for this process and the number of cached entries"""
+        try:
+            entries = self._connect().execute('SELECT COUNT(*) FROM climatology').fetchone()[0]
+        except sqlite3.Error:
+            entries = None
+        return {'entries': entries, 'hits': self.hits, 'misses': self.misses}
+
+
+climatology_cache = ClimatologyCache(
+    os.getenv('CLIMATOLOGY_CACHE_PATH', DEFAULT_CLIMATOLOGY_CACHE_PATH),
+    int(os.getenv('CLIMATOLOGY_CACHE_PRECISION', DEFAULT_CLIMATOLOGY_CACHE_PRECISION))
+)
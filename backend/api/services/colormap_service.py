@@ -0,0 +1,109 @@
+import numpy as np
+from PIL import Image
+
+LUT_SIZE = 1024
+DEFAULT_ALPHA = 200
+
+
+def temperature_scale(t):
+    """Temperature color scale (blue to red)"""
+    r = np.select([t < 0.5, t < 0.75], [0, (t - 0.5) * 4 * 255], 255)
+    g = np.select([t < 0.25, t < 0.75], [t * 4 * 255, 255], (1 - (t - 0.75) * 4) * 255)
+    b = np.select([t < 0.25, t < 0.5], [255, (1 - (t - 0.25) * 4) * 255], 0)
+    return r, g, b
+
+
+def humidity_scale(t):
+    """Humidity (blue to white)"""
+    intensity = t * 255
+    return intensity, intensity, np.full_like(t, 255)
+
+
+def wind_speed_scale(t):
+    """Wind speed (green to yellow to red)"""
+    r = np.where(t < 0.5, t * 2 * 255, 255)
+    g = np.where(t < 0.5, 255, (1 - (t - 0.5) * 2) * 255)
+    return r, g, np.zeros_like(t)
+
+
+def precipitation_scale(t):
+    """Precipitation (light blue to dark blue)"""
+    g = np.floor((1 - t) * 200)
+    b = 100 + np.floor(t * 155)
+    return np.zeros_like(t), g, b
+
+
+def sunlight_scale(t):
+    """Sunlight (yellow to orange to red)"""
+    g = (1 - t * 0.7) * 255
+    return np.full_like(t, 255), g, np.zeros_like(t)
+
+
+def default_scale(t):
+    """Plain white for variables without a registered colormap"""
+    white = np.full_like(t, 255)
+    return white, white, white
+
+
+class ColormapRegistry:
+    """RGBA lookup tables for coloring normalized (0-1) climate grids
+
+    Each colormap is sampled once into a table of ``lut_size`` colors plus a
+    trailing fully transparent entry that NaN values are mapped to, so
+    coloring a whole grid is a single fancy-index into the table.
+    """
+
+    def __init__(self, lut_size=LUT_SIZE):
+        self.lut_size = lut_size
+        self.luts = {}
+
+    def register(self, name, scale, alpha=DEFAULT_ALPHA):
+        """Register a colormap from a vectorized scale function returning r, g, b arrays"""
+        t = np.linspace(0, 1, self.lut_size)
+        r, g, b = scale(t)
+
+        lut = np.zeros((self.lut_size + 1, 4), dtype=np.uint8)
+        lut[:-1, 0] = np.clip(np.floor(r), 0, 255)
+        lut[:-1, 1] = np.clip(np.floor(g), 0, 255)
+        lut[:-1, 2] = np.clip(np.floor(b), 0, 255)
+        lut[:-1, 3] = alpha
+        self.luts[name] = lut
+        return lut
+
+    def register_stops(self, name, stops, alpha=DEFAULT_ALPHA):
+        """Register a colormap linearly interpolated between (position, (r, g, b)) stops"""
+        positions = [position for position, _ in stops]
+        colors = np.array([color for _, color in stops], dtype=float)
+
+        def scale(t):
+            return tuple(np.interp(t, positions, colors[:, channel]) for channel in range(3))
+
+        return self.register(name, scale, alpha)
+
+    def lut(self, name):
+        """Return the lookup table for a colormap, falling back to the default one"""
+        return self.luts.get(name, self.luts['default'])
+
+    def colorize(self, normalized_values, name):
+        """Map normalized values to an (..., 4) uint8 RGBA array, NaNs become transparent"""
+        normalized_values = np.asarray(normalized_values, dtype=float)
+        indices = np.rint(np.clip(normalized_values, 0, 1) * (self.lut_size - 1))
+        indices = np.where(np.isnan(normalized_values), self.lut_size, indices)
+        return self.lut(name)[indices.astype(np.intp)]
+
+    def render(self, normalized_values, name):
+        """Render a 2-D grid of normalized values as an RGBA image"""
+        return Image.fromarray(self.colorize(normalized_values, name))
+
+    def color(self, normalized_value, name):
+        """Return the RGBA tuple for a single normalized value"""
+        return tuple(int(channel) for channel in self.colorize(normalized_value, name))
+
+
+colormap_registry = ColormapRegistry()
+colormap_registry.register('default', default_scale, alpha=DEFAULT_ALPHA)
+colormap_registry.register('temperature', temperature_scale)
+colormap_registry.register('humidity', humidity_scale)
+colormap_registry.register('windSpeed', wind_speed_scale)
+colormap_registry.register('precipitation', precipitation_scale)
+colormap_registry.register('sunlight', sunlight_scale)
@@ -0,0 +1,78 @@
+from collections import OrderedDict
+import os
+import threading
+
+DEFAULT_FRAME_CACHE_BYTES = 256 * 1024 * 1024
+
+
+def frame_size(frame):
+    """Bytes charged for a cached value: encoded bytes, or the payload of a (metadata, payload) tuple"""
+    return len(frame[1]) if isinstance(frame, tuple) else len(frame)
+
+
+class FrameCache:
+    """In-process LRU cache of encoded frames bounded by total size in bytes
+
+    Keys are hashable tuples describing what was rendered (variable, date,
+    hour, size, resolution, format and data version); values are the encoded
+    image bytes, or (metadata, payload) tuples for binary grids. Frames larger
+    than the whole budget are never stored.
+    """
+
+    def __init__(self, max_bytes=DEFAULT_FRAME_CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self.frames = OrderedDict()
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.lock = threading.Lock()
+
+    def get(self, key):
+        """Return the cached frame bytes for key, or None on a miss"""
+        with self.lock:
+            frame = self.frames.get(key)
+            if frame is None:
+                self.misses += 1
+                return None
+            self.frames.move_to_end(key)
+            self.hits += 1
+            return frame
+
+    def put(self, key, frame):
+        """Store frame bytes under key, evicting least recently used frames to fit the budget"""
+        size = frame_size(frame)
+        if size > self.max_bytes:
+            return
+        with self.lock:
+            previous = self.frames.pop(key, None)
+            if previous is not None:
+                self.current_bytes -= frame_size(previous)
+            self.frames[key] = frame
+            self.current_bytes += size
+            while self.current_bytes > self.max_bytes:
+                _, evicted = self.frames.popitem(last=False)
+                self.current_bytes -= frame_size(evicted)
+                self.evictions += 1
+
+    def clear(self):
+        with self.lock:
+            self.frames.clear()
+            self.current_bytes = 0
+
+    def stats(self):
+        """Return hit/miss counters and current memory use"""
+        with self.lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self.frames),
+                'bytes': self.current_bytes,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': self.hits / lookups if lookups else 0.0
+            }
+
+
+frame_cache = FrameCache(int(os.getenv('FRAME_CACHE_MAX_BYTES', DEFAULT_FRAME_CACHE_BYTES)))
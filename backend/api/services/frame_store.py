@@ -0,0 +1,238 @@
+from contextlib import contextmanager
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+
+try:
+    import fcntl
+except ImportError:  # Windows: fall back to unlocked access
+    fcntl = None
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+DEFAULT_FRAME_STORE_DIR = os.path.join(BACKEND_DIR, '.frame_store')
+DEFAULT_FRAME_STORE_BYTES = 2 * 1024 * 1024 * 1024
+EVICT_LOW_WATER = 0.9  # Eviction frees space down to this fraction of max_bytes
+JOURNAL_COMPACT_RECORDS = 10000
+
+
+def key_digest(key):
+    """Return a stable hex digest for a frame cache key tuple"""
+    return hashlib.sha256(repr(key).encode()).hexdigest()
+
+
+class DiskFrameStore:
+    """Persistent, content-addressed store of encoded frames shared by worker processes
+
+    Frames are written once to ``objects/<aa>/<sha256 of bytes>``. The index
+    maps each frame key digest to its object and records every object's size
+    and last access time. It is an ``index.json`` snapshot plus an append-only
+    ``journal.log`` of changes, so a write appends a line instead of
+    rewriting the index. Each process replays only the journal lines it has
+    not seen yet. Reads are recorded in memory and journalled with the
+    process's next write.
+
+    Writers take an exclusive lock on ``.lock``, and a thread lock guards the
+    in-memory index, since file locks do not order threads sharing a
+    process. Object files are written to
+    a temporary name and atomically renamed. Once the store grows past
+    ``max_bytes``, the least recently accessed objects are evicted in one
+    batch down to ``EVICT_LOW_WATER`` of the budget, and the journal is folded
+    into a fresh snapshot.
+    """
+
+    def __init__(self, root=DEFAULT_FRAME_STORE_DIR, max_bytes=DEFAULT_FRAME_STORE_BYTES):
+        self.root = root
+        self.max_bytes = max_bytes
+        self.index_path = os.path.join(root, 'index.json')
+        self.journal_path = os.path.join(root, 'journal.log')
+        self.lock_path = os.path.join(root, '.lock')
+        self.keys = {}      # key digest -> object id
+        self.objects = {}   # object id -> [size, last access time]
+        self.total_bytes = 0
+        self.snapshot_stamp = None
+        self.journal_offset = 0
+        self.journal_records = 0
+        self.accessed = {}  # Reads not yet journalled: object id -> access time
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+
+    @contextmanager
+    def locked(self, exclusive):
+        os.makedirs(self.root, exist_ok=True)
+        with open(self.lock_path, 'a') as lock_file:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def object_path(self, object_id):
+        return os.path.join(self.root, 'objects', object_id[:2], object_id)
+
+    def _load_snapshot(self):
+        try:
+            stat = os.stat(self.index_path)
+            with open(self.index_path) as index_file:
+                snapshot = json.load(index_file)
+        except FileNotFoundError:
+            stat, snapshot = None, {}
+        if snapshot and 'keys' not in snapshot:
+            # Index written before the journal: {digest: {'object', 'size', 'stored_at'}}
+            snapshot = {
+                'keys': {digest: entry['object'] for digest, entry in snapshot.items()},
+                'objects': {entry['object']: [entry['size'], entry['stored_at']] for entry in snapshot.values()}
+            }
+        self.keys = snapshot.get('keys', {})
+        self.objects = snapshot.get('objects', {})
+        self.total_bytes = sum(size for size, _ in self.objects.values())
+        self.snapshot_stamp = (stat.st_mtime_ns, stat.st_size, stat.st_ino) if stat else None
+        self.journal_offset = 0
+        self.journal_records = 0
+
+    def _apply(self, record):
+        if 'put' in record:
+            object_id = record['object']
+            if object_id not in self.objects:
+                self.objects[object_id] = [record['size'], record['at']]
+                self.total_bytes += record['size']
+            self.objects[object_id][1] = max(self.objects[object_id][1], record['at'])
+            self.keys[record['put']] = object_id
+        elif record.get('access') in self.objects:
+            entry = self.objects[record['access']]
+            entry[1] = max(entry[1], record['at'])
+
+    def _sync(self):
+        """Catch up with changes other processes made to the snapshot or the journal"""
+        try:
+            stat = os.stat(self.index_path)
+            stamp = (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+        except FileNotFoundError:
+            stamp = None
+        try:
+            journal_size = os.path.getsize(self.journal_path)
+        except FileNotFoundError:
+            journal_size = 0
+        if stamp != self.snapshot_stamp or journal_size < self.journal_offset:
+            self._load_snapshot()
+        if journal_size > self.journal_offset:
+            with open(self.journal_path, 'rb') as journal:
+                journal.seek(self.journal_offset)
+                data = journal.read(journal_size - self.journal_offset)
+            complete = data[:data.rfind(b'\n') + 1]  # Ignore a line still being written
+            for line in complete.splitlines():
+                self._apply(json.loads(line))
+                self.journal_records += 1
+            self.journal_offset += len(complete)
+
+    def _write_atomic(self, path, data):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix='.tmp-')
+        try:
+            with os.fdopen(fd, 'wb') as tmp_file:
+                tmp_file.write(data)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+    def get(self, key):
+        """Return the stored frame bytes for key, or None on a miss"""
+        digest = key_digest(key)
+        with self.locked(exclusive=False):
+            with self.lock:
+                self._sync()
+                object_id = self.keys.get(digest)
+            if object_id is not None:
+                try:
+                    with open(self.object_path(object_id), 'rb') as frame_file:
+                        frame = frame_file.read()
+                except FileNotFoundError:
+                    pass
+                else:
+                    with self.lock:
+                        self.accessed[object_id] = time.time()
+                        self.hits += 1
+                    return frame
+        with self.lock:
+            self.misses += 1
+        return None
+
+    def put(self, key, frame):
+        """Store frame bytes under key, evicting least recently used objects past the budget"""
+        if len(frame) > self.max_bytes:
+            return
+        object_id = hashlib.sha256(frame).hexdigest()
+        with self.locked(exclusive=True), self.lock:
+            self._sync()
+            path = self.object_path(object_id)
+            if object_id not in self.objects or not os.path.exists(path):
+                self._write_atomic(path, frame)
+
+            now = time.time()
+            records = [{'access': accessed_id, 'at': at} for accessed_id, at in self.accessed.items()]
+            records.append({'put': key_digest(key), 'object': object_id, 'size': len(frame), 'at': now})
+            self.accessed = {}
+            for record in records:
+                self._apply(record)
+
+            if self.total_bytes > self.max_bytes:
+                self._evict()
+                self._compact()
+            elif self.journal_records + len(records) > JOURNAL_COMPACT_RECORDS:
+                self._compact()
+            else:
+                with open(self.journal_path, 'ab') as journal:
+                    journal.write(b''.join(json.dumps(record).encode() + b'\n' for record in records))
+                    journal.flush()
+                    self.journal_offset = journal.tell()
+                self.journal_records += len(records)
+
+    def _evict(self):
+        """Drop least recently accessed objects, and every key pointing at them, down to the low-water mark"""
+        target = self.max_bytes * EVICT_LOW_WATER
+        evicted = set()
+        for object_id in sorted(self.objects, key=lambda object_id: self.objects[object_id][1]):
+            if self.total_bytes <= target:
+                break
+            try:
+                os.remove(self.object_path(object_id))
+            except FileNotFoundError:
+                pass
+            self.total_bytes -= self.objects.pop(object_id)[0]
+            evicted.add(object_id)
+        self.keys = {digest: object_id for digest, object_id in self.keys.items() if object_id not in evicted}
+
+    def _compact(self):
+        """Fold the journal into a new snapshot and empty it; callers hold the exclusive lock"""
+        self._write_atomic(self.index_path, json.dumps({'keys': self.keys, 'objects': self.objects}).encode())
+        with open(self.journal_path, 'wb'):
+            pass
+        stat = os.stat(self.index_path)
+        self.snapshot_stamp = (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+        self.journal_offset = 0
+        self.journal_records = 0
+
+    def stats(self):
+        """Return hit/miss counters for this process and the store's current size"""
+        with self.locked(exclusive=False), self.lock:
+            self._sync()
+            entries, total = len(self.keys), self.total_bytes
+        return {
+            'entries': entries,
+            'bytes': total,
+            'max_bytes': self.max_bytes,
+            'hits': self.hits,
+            'misses': self.misses
+        }
+
+
+frame_store = DiskFrameStore(
+    os.getenv('FRAME_STORE_DIR', DEFAULT_FRAME_STORE_DIR),
+    int(os.getenv('FRAME_STORE_MAX_BYTES', DEFAULT_FRAME_STORE_BYTES))
+)
@@ -0,0 +1,57 @@
+import numpy as np
+
+# dtype, reserved nodata value and number of usable quantization steps
+GRID_ENCODINGS = {
+    'uint8': {'dtype': '<u1', 'nodata': 255, 'steps': 254},
+    'uint16': {'dtype': '<u2', 'nodata': 65535, 'steps': 65534},
+    'float16': {'dtype': '<f2', 'nodata': None, 'steps': None},
+}
+
+
+def quantize_grid(values, encoding='uint16'):
+    """Pack a 2-D float grid into little-endian bytes plus the metadata needed to decode it
+
+    Integer encodings map [min, max] linearly onto 0..steps so that
+    ``value = offset + stored * scale``, and store NaN as the reserved nodata
+    value. float16 stores the values directly with NaN as nodata.
+    """
+    if encoding not in GRID_ENCODINGS:
+        raise ValueError(f"Unknown grid encoding '{encoding}'. Expected one of {list(GRID_ENCODINGS)}.")
+    spec = GRID_ENCODINGS[encoding]
+    values = np.asarray(values, dtype=float)
+    nan_mask = np.isnan(values)
+
+    vmin = float(np.nanmin(values)) if not nan_mask.all() else 0.0
+    vmax = float(np.nanmax(values)) if not nan_mask.all() else 0.0
+
+    if spec['steps'] is None:
+        stored = values.astype(spec['dtype'])
+        scale, offset = 1.0, 0.0
+    else:
+        scale = (vmax - vmin) / spec['steps'] if vmax > vmin else 1.0
+        offset = vmin
+        stored = np.rint((np.nan_to_num(values, nan=vmin) - offset) / scale)
+        stored = np.clip(stored, 0, spec['steps']).astype(spec['dtype'])
+        stored[nan_mask] = spec['nodata']
+
+    metadata = {
+        'encoding': encoding,
+        'dtype': spec['dtype'],
+        'height': values.shape[0],
+        'width': values.shape[1],
+        'scale': scale,
+        'offset': offset,
+        'min': vmin,
+        'max': vmax,
+        'nodata': spec['nodata'],
+    }
+    return stored.tobytes(), metadata
+
+
+def dequantize_grid(payload, metadata):
+    """Decode bytes produced by quantize_grid back into a float grid with NaN for nodata"""
+    stored = np.frombuffer(payload, dtype=metadata['dtype']).reshape(metadata['height'], metadata['width'])
+    values = stored.astype(float) * metadata['scale'] + metadata['offset']
+    if metadata['nodata'] is not None:
+        values[stored == metadata['nodata']] = np.nan
+    return values
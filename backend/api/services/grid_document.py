@@ -0,0 +1,113 @@
+from bson.binary import Binary
+import numpy as np
+
+GRID_DOCUMENT_VERSION = 1
+GRID_DOCUMENT_DTYPE = '<f4'
+CLIMATE_VARIABLES = ['temperature', 'humidity', 'windSpeed', 'precipitation', 'sunlight']
+
+
+def pack_array(values):
+    """Pack a float array as little-endian float32 bytes for a BSON Binary field"""
+    return Binary(np.asarray(values, dtype=GRID_DOCUMENT_DTYPE).tobytes())
+
+
+def unpack_array(payload, shape=None):
+    """Unpack a little-endian float32 Binary field into a float array of the given shape"""
+    values = np.frombuffer(payload, dtype=GRID_DOCUMENT_DTYPE).astype(float)
+    return values.reshape(shape) if shape is not None else values
+
+
+def grid_descriptor(lats, lons):
+    """Describe how point samples map onto stored arrays
+
+    Samples on distinct nodes of a rectilinear lat/lon grid that fill at least
+    half of it are stored as a (lat, lon) array with NaN for nodes without a
+    sample, described by their axes. Anything else is stored as a flat point list with packed coordinates.
+    Returns (descriptor, cells) where cells gives each sample's flat position in
+    the stored arrays.
+    """
+    lats = np.asarray(lats, dtype=float)
+    lons = np.asarray(lons, dtype=float)
+    lat_axis = np.unique(lats)
+    lon_axis = np.unique(lons)
+
+    if len(lat_axis) >= 2 and len(lon_axis) >= 2 and len(lat_axis) * len(lon_axis) <= 2 * len(lats):
+        cells = np.searchsorted(lat_axis, lats) * len(lon_axis) + np.searchsorted(lon_axis, lons)
+        if len(np.unique(cells)) == len(cells):
+            descriptor = {
+                'kind': 'regular',
+                'shape': [len(lat_axis), len(lon_axis)],
+                'lat': lat_axis.tolist(),
+                'lon': lon_axis.tolist(),
+                'dtype': GRID_DOCUMENT_DTYPE,
+            }
+            return descriptor, cells
+
+    descriptor = {
+        'kind': 'points',
+        'shape': [len(lats)],
+        'lat': pack_array(lats),
+        'lon': pack_array(lons),
+        'dtype': GRID_DOCUMENT_DTYPE,
+    }
+    return descriptor, np.arange(len(lats))
+
+
+def encode_grid_document(date, timestamp, lats, lons, columns):
+    """Build one document holding every variable of a timestamp as packed arrays
+
+    Args:
+        date (str): YYYYMMDD date key
+        timestamp (str): ISO timestamp of the hour
+        lats, lons: Sample coordinates
+        columns (dict): Variable name -> sample values aligned with lats/lons
+    """
+    descriptor, cells = grid_descriptor(lats, lons)
+    size = int(np.prod(descriptor['shape']))
+
+    values = {}
+    for variable, column in columns.items():
+        stored = np.full(size, np.nan)
+        stored[cells] = np.asarray(column, dtype=float)
+        values[variable] = pack_array(stored)
+
+    return {
+        'schema_version': GRID_DOCUMENT_VERSION,
+        'date': date,
+        'timestamp': timestamp,
+        'point_count': len(cells),
+        'grid': descriptor,
+        'values': values,
+    }
+
+
+def decode_grid_document(document, variable):
+    """Return a variable of a grid document in the layouts extract_points understands
+
+    A complete regular grid comes back as {'lat': axis, 'lon': axis, variable:
+    2-D values} so interpolation can take the rectilinear fast path; sparse
+    grids and point lists come back as flat columns with missing samples
+    dropped. Returns None when the document does not hold the variable or
+    every sample of it is missing.
+    """
+    payload = document.get('values', {}).get(variable)
+    if payload is None:
+        return None
+
+    descriptor = document['grid']
+    values = unpack_array(payload)
+    if descriptor['kind'] == 'regular':
+        lat_axis = np.asarray(descriptor['lat'], dtype=float)
+        lon_axis = np.asarray(descriptor['lon'], dtype=float)
+        grid_values = values.reshape(descriptor['shape'])
+        if not np.isnan(grid_values).any():
+            return {'lat': lat_axis, 'lon': lon_axis, variable: grid_values}
+        lon_mesh, lat_mesh = np.meshgrid(lon_axis, lat_axis)
+        lats, lons = lat_mesh.ravel(), lon_mesh.ravel()
+    else:
+        lats, lons = unpack_array(descriptor['lat']), unpack_array(descriptor['lon'])
+
+    present = ~np.isnan(values)
+    if not present.any():
+        return None
+    return {'lat': lats[present], 'lon': lons[present], variable: values[present]}
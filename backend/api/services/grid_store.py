@@ -0,0 +1,142 @@
+import json
+import os
+import tempfile
+
+import numpy as np
+
+DEFAULT_GRID_STORE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), '.grid_store')
+GRID_STORE_DTYPE = '<f8'  # Matches the interpolation dtype so mapped hours are used without conversion
+HOURS_PER_DAY = 24
+
+
+class LocalGridStore:
+    """On-disk store of ingested grids, one memory-mapped file per variable and day
+
+    Each day is a ``<variable>/<YYYYMMDD>.npy`` array of shape (24, nlat, nlon),
+    hour first, with NaN where no sample exists, and a ``.json`` sidecar holding
+    the ascending lat/lon axes and the timestamp of each hour slot. Files are
+    replaced atomically, so readers holding an old mapping keep a consistent
+    view while a sync rewrites the day.
+    """
+
+    def __init__(self, root=DEFAULT_GRID_STORE_DIR):
+        self.root = root
+
+    def day_path(self, variable, date):
+        return os.path.join(self.root, variable, f'{date}.npy')
+
+    def meta_path(self, variable, date):
+        return os.path.join(self.root, variable, f'{date}.json')
+
+    def _write_atomic(self, path, write):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix='.tmp-')
+        try:
+            with os.fdopen(fd, 'wb') as tmp_file:
+                write(tmp_file)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+    def _hour_points(self, data, variable):
+        """Return flat lat, lon and value arrays of a gridded or columnar hour"""
+        if np.ndim(data[variable]) == 2:
+            lon_mesh, lat_mesh = np.meshgrid(data['lon'], data['lat'])
+            return lat_mesh.ravel(), lon_mesh.ravel(), np.asarray(data[variable], dtype=float).ravel()
+        return (np.asarray(data['lat'], dtype=float), np.asarray(data['lon'], dtype=float),
+                np.asarray(data[variable], dtype=float))
+
+    def write_day(self, variable, date, hours):
+        """Write a day from {hour: (timestamp, gridded or columnar dict)}, laying every hour on the union of their nodes
+
+        Returns:
+            tuple: Shape of the stored (24, nlat, nlon) array
+        """
+        points = {hour: (timestamp, self._hour_points(data, variable)) for hour, (timestamp, data) in hours.items()}
+        lat_axis = np.unique(np.concatenate([lats for _, (lats, _, _) in points.values()]))
+        lon_axis = np.unique(np.concatenate([lons for _, (_, lons, _) in points.values()]))
+
+        values = np.full((HOURS_PER_DAY, len(lat_axis), len(lon_axis)), np.nan, dtype=GRID_STORE_DTYPE)
+        timestamps = [None] * HOURS_PER_DAY
+        for hour, (timestamp, (lats, lons, column)) in points.items():
+            values[hour, np.searchsorted(lat_axis, lats), np.searchsorted(lon_axis, lons)] = column
+            timestamps[hour] = timestamp
+
+        meta = {'lat': lat_axis.tolist(), 'lon': lon_axis.tolist(), 'timestamps': timestamps,
+                'shape': list(values.shape), 'dtype': GRID_STORE_DTYPE}
+        self._write_atomic(self.day_path(variable, date), lambda day_file: np.save(day_file, values))
+        self._write_atomic(self.meta_path(variable, date), lambda meta_file: meta_file.write(json.dumps(meta).encode()))
+        return values.shape
+
+    def open_day(self, variable, date):
+        """Map a stored day read-only, or return None when it is missing or mid-rewrite
+
+        Returns:
+            dict: {'lat': axis, 'lon': axis, 'timestamps': [...], 'values': (24, nlat, nlon) memmap}
+        """
+        try:
+            with open(self.meta_path(variable, date)) as meta_file:
+                meta = json.load(meta_file)
+            values = np.load(self.day_path(variable, date), mmap_mode='r')
+        except (FileNotFoundError, ValueError):
+            return None
+        if list(values.shape) != meta['shape']:
+            return None
+        return {'lat': np.asarray(meta['lat']), 'lon': np.asarray(meta['lon']),
+                'timestamps': meta['timestamps'], 'values': values}
+
+    def hour_data(self, day, variable, hour):
+        """Return one hour of an opened day as gridded data backed by the mapping, or None if it is empty
+
+        A complete hour is returned as {'lat', 'lon', variable: (nlat, nlon) view};
+        an hour with missing nodes comes back as flat columns without them.
+        """
+        hour_values = day['values'][hour]
+        missing = np.isnan(hour_values)
+        if missing.all():
+            return None
+        if not missing.any():
+            return {'lat': day['lat'], 'lon': day['lon'], variable: hour_values}
+        lon_mesh, lat_mesh = np.meshgrid(day['lon'], day['lat'])
+        present = ~missing
+        return {'lat': lat_mesh[present], 'lon': lon_mesh[present], variable: np.asarray(hour_values[present])}
+
+    def read_day(self, variable, date):
+        """Return {timestamp: point data} for every stored hour of a day, or None if the day is not stored"""
+        day = self.open_day(variable, date)
+        if day is None:
+            return None
+        hours = {}
+        for hour, timestamp in enumerate(day['timestamps']):
+            data = self.hour_data(day, variable, hour) if timestamp is not None else None
+            if data is not None:
+                hours[timestamp] = data
+        return hours
+
+    def read_hour(self, variable, date, hour):
+        """Return the point data of one stored hour, or None if the day or hour is not stored"""
+        day = self.open_day(variable, date)
+        if day is None or day['timestamps'][hour] is None:
+            return None
+        return self.hour_data(day, variable, hour)
+
+    def inventory(self):
+        """Return {variable: [stored days]} for every variable with at least one stored day"""
+        try:
+            variables = sorted(os.listdir(self.root))
+        except FileNotFoundError:
+            return {}
+        inventory = {variable: self.days(variable) for variable in variables}
+        return {variable: days for variable, days in inventory.items() if days}
+
+    def days(self, variable):
+        """List the stored YYYYMMDD days of a variable"""
+        try:
+            names = os.listdir(os.path.join(self.root, variable))
+        except (FileNotFoundError, NotADirectoryError):
+            return []
+        return sorted(name[:-len('.npy')] for name in names if name.endswith('.npy'))
+
+
+local_grid_store = LocalGridStore(os.getenv('GRID_STORE_DIR', DEFAULT_GRID_STORE_DIR))
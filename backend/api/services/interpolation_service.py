@@ -0,0 +1,186 @@
+from collections import OrderedDict
+import hashlib
+import os
+import threading
+import numpy as np
+from scipy.interpolate import CloughTocher2DInterpolator, RegularGridInterpolator
+from scipy.spatial import Delaunay
+
+DEFAULT_MAX_PLANS = 16
+DEFAULT_MAX_PLAN_BYTES = int(os.getenv('INTERPOLATION_PLAN_CACHE_BYTES', 256 * 1024 * 1024))
+
+
+def array_digest(*arrays):
+    """Return a short content hash identifying a set of coordinate arrays"""
+    digest = hashlib.sha1()
+    for array in arrays:
+        array = np.ascontiguousarray(array, dtype=np.float64)
+        digest.update(str(array.shape).encode())
+        digest.update(array.tobytes())
+    return digest.hexdigest()
+
+
+class InterpolationPlan:
+    """Delaunay triangulation of a source point set plus barycentric weights onto a target mesh
+
+    Building the plan is the expensive part of scattered interpolation. Once
+    built, linear interpolation of any value vector (or (N, k) value matrix)
+    over the same source points is a gather of three vertices per target
+    point and a weighted sum.
+    """
+
+    def __init__(self, lats, lons, target_lats, target_lons):
+        self.shape = (len(target_lats), len(target_lons))
+        self.target_lats = np.asarray(target_lats, dtype=float)
+        self.target_lons = np.asarray(target_lons, dtype=float)
+        target_points = self.target_points()
+
+        self.triangulation = Delaunay(np.column_stack((lons, lats)))
+        simplices = self.triangulation.find_simplex(target_points)
+        self.inside = simplices >= 0
+
+        # Barycentric coordinates of each covered target point in its simplex
+        transform = self.triangulation.transform[simplices[self.inside]]
+        offsets = target_points[self.inside] - transform[:, 2]
+        barycentric = np.einsum('ijk,ik->ij', transform[:, :2], offsets)
+        self.vertices = self.triangulation.simplices[simplices[self.inside]]
+        self.weights = np.column_stack((barycentric, 1 - barycentric.sum(axis=1)))
+
+    def target_points(self):
+        """Return the (lon, lat) target mesh points; rebuilt on demand rather than kept in the plan"""
+        target_lon_mesh, target_lat_mesh = np.meshgrid(self.target_lons, self.target_lats)
+        return np.column_stack((target_lon_mesh.ravel(), target_lat_mesh.ravel()))
+
+    @property
+    def nbytes(self):
+        """Approximate memory held by the plan's arrays"""
+        triangulation = self.triangulation
+        return sum(array.nbytes for array in (
+            self.inside, self.vertices, self.weights, self.target_lats, self.target_lons,
+            triangulation.points, triangulation.simplices, triangulation.neighbors, triangulation.transform
+        ))
+
+    def linear(self, values, fill_value=np.nan):
+        """Linearly interpolate values given at the source points onto the target mesh"""
+        values = np.asarray(values, dtype=float)
+        result = np.full((self.inside.size,) + values.shape[1:], fill_value, dtype=float)
+        result[self.inside] = np.einsum('ij,ij...->i...', self.weights, values[self.vertices])
+        return result.reshape(self.shape + values.shape[1:])
+
+    def cubic(self, values, fill_value=np.nan):
+        """Clough-Tocher interpolate values onto the target mesh, reusing the cached triangulation"""
+        values = np.asarray(values, dtype=float)
+        interpolator = CloughTocher2DInterpolator(self.triangulation, values)
+        result = interpolator(self.target_points())
+        result[~self.inside] = fill_value
+        return result.reshape(self.shape + values.shape[1:])
+
+
+class InterpolationPlanCache:
+    """LRU cache of interpolation plans keyed by source points and target mesh
+
+    Bounded both by entry count and by the plans' total nbytes, since a plan
+    for a large target mesh holds tens of bytes per pixel. A plan larger than
+    max_bytes on its own is returned without being cached.
+    """
+
+    def __init__(self, max_entries=DEFAULT_MAX_PLANS, max_bytes=DEFAULT_MAX_PLAN_BYTES):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.plans = OrderedDict()
+        self.total_bytes = 0
+        self.lock = threading.Lock()
+
+    def get_plan(self, lats, lons, target_lats, target_lons):
+        """Return the cached plan for this layout, building and storing it on a miss"""
+        key = (array_digest(lats, lons), array_digest(target_lats, target_lons))
+        with self.lock:
+            plan = self.plans.get(key)
+            if plan is not None:
+                self.plans.move_to_end(key)
+                return plan
+
+        plan = InterpolationPlan(lats, lons, target_lats, target_lons)
+        if plan.nbytes > self.max_bytes:
+            return plan
+        with self.lock:
+            previous = self.plans.pop(key, None)
+            if previous is not None:
+                self.total_bytes -= previous.nbytes
+            self.plans[key] = plan
+            self.total_bytes += plan.nbytes
+            while len(self.plans) > self.max_entries or self.total_bytes > self.max_bytes:
+                _, evicted = self.plans.popitem(last=False)
+                self.total_bytes -= evicted.nbytes
+        return plan
+
+    def clear(self):
+        with self.lock:
+            self.plans.clear()
+            self.total_bytes = 0
+
+
+interpolation_plans = InterpolationPlanCache()
+
+
+def regular_grid_layout(lats, lons):
+    """Detect samples that cover every node of a rectilinear lat/lon grid exactly once
+
+    Returns (lat_axis, lon_axis, order) where values[order] reshapes to
+    (len(lat_axis), len(lon_axis)), or None for sparse or irregular samples.
+    """
+    lats = np.asarray(lats, dtype=float)
+    lons = np.asarray(lons, dtype=float)
+    lat_axis = np.unique(lats)
+    lon_axis = np.unique(lons)
+    if len(lat_axis) < 2 or len(lon_axis) < 2 or len(lat_axis) * len(lon_axis) != len(lats):
+        return None
+
+    cells = np.searchsorted(lat_axis, lats) * len(lon_axis) + np.searchsorted(lon_axis, lons)
+    order = np.argsort(cells, kind='stable')
+    if np.any(cells[order] != np.arange(len(cells))):
+        return None  # Duplicate samples leave other nodes empty
+    return lat_axis, lon_axis, order
+
+
+def interpolate_regular_grid(lat_axis, lon_axis, grid_values, target_lats, target_lons, method='linear', fill_value=np.nan):
+    """Resample values on a rectilinear (lat_axis, lon_axis) grid onto the target mesh
+
+    Uses separable regular-grid interpolation; cubic falls back to linear when
+    an axis has too few nodes for a cubic spline.
+    """
+    if method == 'cubic' and min(len(lat_axis), len(lon_axis)) < 4:
+        method = 'linear'
+    grid_values = np.asarray(grid_values, dtype=float)
+    interpolator = RegularGridInterpolator(
+        (lat_axis, lon_axis), grid_values,
+        method=method, bounds_error=False, fill_value=np.nan
+    )
+    target_lon_mesh, target_lat_mesh = np.meshgrid(target_lons, target_lats)
+    result = interpolator((target_lat_mesh, target_lon_mesh))
+
+    outside = ((target_lat_mesh < lat_axis[0]) | (target_lat_mesh > lat_axis[-1]) |
+               (target_lon_mesh < lon_axis[0]) | (target_lon_mesh > lon_axis[-1]))
+    result[outside] = fill_value
+    return result
+
+
+def interpolate_points_to_grid(lats, lons, values, target_lats, target_lons, method='linear', fill_value=np.nan):
+    """Interpolate (lat, lon) samples onto the target_lats x target_lons mesh
+
+    values may be a vector or an (N, k) matrix of several variables. The result
+    has shape (len(target_lats), len(target_lons)) plus any trailing value axes.
+    Samples forming a complete regular grid are resampled directly; anything
+    else goes through a cached Delaunay interpolation plan.
+    """
+    values = np.asarray(values, dtype=float)
+    layout = regular_grid_layout(lats, lons)
+    if layout is not None:
+        lat_axis, lon_axis, order = layout
+        grid_values = values[order].reshape((len(lat_axis), len(lon_axis)) + values.shape[1:])
+        return interpolate_regular_grid(lat_axis, lon_axis, grid_values, target_lats, target_lons, method, fill_value)
+
+    plan = interpolation_plans.get_plan(lats, lons, target_lats, target_lons)
+    if method == 'cubic':
+        return plan.cubic(values, fill_value)
+    return plan.linear(values, fill_value)
@@ -0,0 +1,37 @@
+import os
+
+# Open-Meteo accepts comma separated coordinate lists and answers with one result per location, in order
+OPENMETEO_MAX_LOCATIONS = int(os.getenv('OPENMETEO_MAX_LOCATIONS', 100))
+
+
+def grid_locations(resolution, lat_start=-90, lat_end=90, lon_start=-180, lon_end=180):
+    """List the (lat, lon) cells of a global grid in row-major order"""
+    return [(lat, lon)
+            for lat in range(lat_start, lat_end + 1, resolution)
+            for lon in range(lon_start, lon_end + 1, resolution)]
+
+
+def chunk_locations(locations, size=OPENMETEO_MAX_LOCATIONS):
+    """Split locations into consecutive chunks of at most size"""
+    size = max(1, size)
+    return [locations[i:i + size] for i in range(0, len(locations), size)]
+
+
+def location_params(chunk):
+    """Return the latitude/longitude query parameters for one chunk of locations"""
+    return {
+        'latitude': ','.join(str(lat) for lat, _ in chunk),
+        'longitude': ','.join(str(lon) for _, lon in chunk),
+    }
+
+
+def split_json_locations(chunk, payload):
+    """Pair each requested location with its result from a JSON response
+
+    A single-location request returns one object, a multi-location request a
+    list in request order.
+    """
+    results = payload if isinstance(payload, list) else [payload]
+    if len(results) != len(chunk):
+        raise ValueError(f"Expected {len(chunk)} locations in the response, got {len(results)}")
+    return list(zip(chunk, results))
@@ -0,0 +1,79 @@
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+import multiprocessing
+import os
+import threading
+
+RENDER_EXECUTOR_KINDS = ('process', 'thread', 'inline')
+DEFAULT_RENDER_WORKERS = min(4, os.cpu_count() or 1)
+DEFAULT_MAX_IN_FLIGHT = 4
+# Workers start from a clean interpreter rather than a fork of a request thread that may hold locks
+RENDER_START_METHOD = 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+
+
+class RenderExecutor:
+    """Shared pool that renders independent frames in parallel, in order
+
+    'process' runs jobs in a process pool so the Python-heavy colorize and
+    encode steps escape the GIL, 'thread' uses a thread pool and 'inline'
+    renders on the calling thread. The pool is created on first use, and
+    process workers are never forked from the threaded server. Each
+    imap call keeps at most ``max_in_flight`` of its jobs queued, so a single
+    timeline request cannot monopolise the workers.
+    """
+
+    def __init__(self, kind='process', max_workers=DEFAULT_RENDER_WORKERS, max_in_flight=DEFAULT_MAX_IN_FLIGHT):
+        if kind not in RENDER_EXECUTOR_KINDS:
+            raise ValueError(f"Unknown render executor kind '{kind}'. Expected one of {RENDER_EXECUTOR_KINDS}.")
+        self.kind = kind
+        self.max_workers = max(1, max_workers)
+        self.max_in_flight = max(1, max_in_flight)
+        self.pool = None
+        self.lock = threading.Lock()
+
+    def _get_pool(self):
+        with self.lock:
+            if self.pool is None:
+                if self.kind == 'process':
+                    self.pool = ProcessPoolExecutor(max_workers=self.max_workers,
+                                                    mp_context=multiprocessing.get_context(RENDER_START_METHOD))
+                else:
+                    self.pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='render')
+            return self.pool
+
+    def imap(self, fn, jobs):
+        """Yield fn(*args) for each args tuple in jobs, in order
+
+        jobs is consumed lazily, so job arguments are only built when a slot in
+        this call's in-flight window opens up.
+        """
+        if self.kind == 'inline':
+            for args in jobs:
+                yield fn(*args)
+            return
+
+        pool = self._get_pool()
+        pending = deque()
+        try:
+            for args in jobs:
+                pending.append(pool.submit(fn, *args))
+                if len(pending) >= self.max_in_flight:
+                    yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
+        finally:
+            for future in pending:
+                future.cancel()
+
+    def shutdown(self):
+        with self.lock:
+            if self.pool is not None:
+                self.pool.shutdown(cancel_futures=True)
+                self.pool = None
+
+
+render_executor = RenderExecutor(
+    os.getenv('RENDER_EXECUTOR', 'process'),
+    int(os.getenv('RENDER_WORKERS', DEFAULT_RENDER_WORKERS)),
+    int(os.getenv('RENDER_MAX_IN_FLIGHT', DEFAULT_MAX_IN_FLIGHT))
+)
@@ -0,0 +1,32 @@
+import math
+import numpy as np
+
+TILE_SIZE = 256
+TILE_SCHEMES = ('mercator', 'geographic')
+
+
+def tile_count(z, scheme='mercator'):
+    """Return the number of (x, y) tiles at zoom level z for a tiling scheme"""
+    if scheme == 'geographic':
+        return 2 ** (z + 1), 2 ** z
+    return 2 ** z, 2 ** z
+
+
+def tile_pixel_coordinates(z, x, y, size=TILE_SIZE, scheme='mercator'):
+    """Return the latitude of each pixel row and longitude of each pixel column of a tile
+
+    'mercator' is the Web Mercator XYZ scheme used by slippy maps; 'geographic'
+    is the equirectangular scheme with two root tiles that Cesium's
+    GeographicTilingScheme uses. Rows run north to south.
+    """
+    tiles_x, tiles_y = tile_count(z, scheme)
+    pixel_centers = (np.arange(size) + 0.5) / size
+
+    lons = -180 + (x + pixel_centers) * 360 / tiles_x
+    if scheme == 'geographic':
+        lats = 90 - (y + pixel_centers) * 180 / tiles_y
+    else:
+        mercator_y = math.pi * (1 - 2 * (y + pixel_centers) / tiles_y)
+        lats = np.degrees(np.arctan(np.sinh(mercator_y)))
+    return lats, lons
+
@@ -0,0 +1,312 @@
+import asyncio
+import os
+import random
+import threading
+import time
+from urllib.parse import urlsplit
+
+import aiohttp
+
+try:
+    import niquests as http  # requests compatible, negotiates HTTP/2 over TLS
+except ImportError:  # Fall back to HTTP/1.1 keep-alive
+    import requests as http
+
+UPSTREAM_POOL_SIZE = int(os.getenv('UPSTREAM_POOL_SIZE', 20))
+UPSTREAM_MAX_PER_HOST = int(os.getenv('UPSTREAM_MAX_PER_HOST', 8))
+UPSTREAM_RETRIES = int(os.getenv('UPSTREAM_RETRIES', 2))
+UPSTREAM_BACKOFF = float(os.getenv('UPSTREAM_BACKOFF', 0.5))
+UPSTREAM_BREAKER_THRESHOLD = int(os.getenv('UPSTREAM_BREAKER_THRESHOLD', 5))
+UPSTREAM_BREAKER_RESET = float(os.getenv('UPSTREAM_BREAKER_RESET', 30))
+UPSTREAM_MAX_RETRY_WAIT = float(os.getenv('UPSTREAM_MAX_RETRY_WAIT', 2))  # Longest pause between attempts, in seconds
+UPSTREAM_ASYNC_MAX_PER_HOST = int(os.getenv('UPSTREAM_ASYNC_MAX_PER_HOST', 100))
+RETRYABLE_UPSTREAM_STATUSES = {429, 500, 502, 503, 504}
+# Requests in flight per upstream host overriding the client default, as 'host=limit,host=limit'.
+# NASA POWER throttles bursts, so it keeps the small cap the bulk climate route always had.
+UPSTREAM_HOST_LIMITS = dict(
+    (host.strip(), int(limit)) for host, limit in
+    (entry.split('=') for entry in os.getenv('UPSTREAM_HOST_LIMITS', 'power.larc.nasa.gov=5').split(',') if entry.strip())
+)
+
+UpstreamHTTPError = http.exceptions.HTTPError
+
+
+class UpstreamUnavailable(Exception):
+    """Raised without touching the network while a host's circuit is open"""
+
+
+class CircuitBreaker:
+    """Per-host circuit breaker
+
+    After ``threshold`` consecutive failed requests (counted once per logical
+    request, after its retries) the circuit opens and
+    requests fail immediately for ``reset_timeout`` seconds. The first request
+    after that is let through as a probe: success closes the circuit, failure
+    opens it for another ``reset_timeout``.
+    """
+
+    def __init__(self, threshold=UPSTREAM_BREAKER_THRESHOLD, reset_timeout=UPSTREAM_BREAKER_RESET):
+        self.threshold = max(1, threshold)
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at = None
+        self.probing = False
+        self.lock = threading.Lock()
+
+    @property
+    def state(self):
+        if self.opened_at is None:
+            return 'closed'
+        if self.probing or time.monotonic() - self.opened_at >= self.reset_timeout:
+            return 'half-open'
+        return 'open'
+
+    def allow(self):
+        """Return whether a request may go out now, claiming the probe slot of a half-open circuit"""
+        with self.lock:
+            if self.opened_at is None:
+                return True
+            if self.probing or time.monotonic() - self.opened_at < self.reset_timeout:
+                return False
+            self.probing = True
+            return True
+
+    def record_success(self):
+        with self.lock:
+            self.failures = 0
+            self.opened_at = None
+            self.probing = False
+
+    def release(self):
+        """Give back a probe slot without a verdict, e.g. when the request could not be sent"""
+        with self.lock:
+            self.probing = False
+
+    def record_failure(self):
+        with self.lock:
+            self.failures += 1
+            if self.probing or self.failures >= self.threshold:
+                self.opened_at = time.monotonic()
+            self.probing = False
+
+
+def retry_delay(attempt, backoff, max_wait, retry_after=None):
+    """
+    Return the pause before the next attempt: exponential backoff with full jitter, stretched to a Retry-After
+
+    Pauses never exceed max_wait, so an interactive request does not hold its
+    worker for long. Returns None, meaning give up and return the response,
+    when the upstream asks for a longer wait than that.
+    """
+    delay = random.uniform(0, min(max_wait, backoff * 2 ** attempt))
+    if retry_after and retry_after.isdigit():
+        if float(retry_after) > max_wait:
+            return None
+        delay = max(delay, float(retry_after))
+    return delay
+
+
+def host_limit(host, default):
+    """Return the in-flight request cap of a host: its UPSTREAM_HOST_LIMITS entry, or default"""
+    return max(1, UPSTREAM_HOST_LIMITS.get(host.split(':')[0], default))
+
+
+class UpstreamClient:
+    """Shared HTTP client for the NASA POWER and Open-Meteo APIs
+
+    Keeps one pooled keep-alive session per process, caps the requests in
+    flight to each host, retries connection errors, timeouts, 429 and 5xx
+    responses with jittered exponential backoff, and fails fast through a
+    per-host circuit breaker while an upstream is down instead of holding a
+    worker for the full timeout of every request.
+    """
+
+    def __init__(self, pool_size=UPSTREAM_POOL_SIZE, max_per_host=UPSTREAM_MAX_PER_HOST, retries=UPSTREAM_RETRIES,
+                 backoff=UPSTREAM_BACKOFF, breaker_threshold=UPSTREAM_BREAKER_THRESHOLD,
+                 breaker_reset=UPSTREAM_BREAKER_RESET, max_retry_wait=UPSTREAM_MAX_RETRY_WAIT):
+        self.pool_size = pool_size
+        self.max_per_host = max(1, max_per_host)
+        self.retries = retries
+        self.backoff = backoff
+        self.max_retry_wait = max_retry_wait
+        self.breaker_threshold = breaker_threshold
+        self.breaker_reset = breaker_reset
+        self.session = None
+        self.session_pid = None
+        self.hosts = {}
+        self.lock = threading.Lock()
+
+    def _get_session(self):
+        # A forked worker opens its own connections instead of sharing its parent's sockets
+        with self.lock:
+            if self.session is None or self.session_pid != os.getpid():
+                if http.__name__ == 'niquests':
+                    self.session = http.Session(pool_connections=self.pool_size, pool_maxsize=self.pool_size)
+                else:
+                    self.session = http.Session()
+                    adapter = http.adapters.HTTPAdapter(pool_connections=self.pool_size, pool_maxsize=self.pool_size)
+                    self.session.mount('https://', adapter)
+                    self.session.mount('http://', adapter)
+                self.session_pid = os.getpid()
+            return self.session
+
+    def _get_host(self, url):
+        host = urlsplit(url).netloc
+        with self.lock:
+            if host not in self.hosts:
+                self.hosts[host] = (threading.BoundedSemaphore(host_limit(host, self.max_per_host)),
+                                    CircuitBreaker(self.breaker_threshold, self.breaker_reset))
+            return host, self.hosts[host]
+
+    def breaker(self, url):
+        return self._get_host(url)[1][1]
+
+    def get(self, url, params=None, timeout=30, retries=None):
+        """
+        GET url through the shared session
+
+        Returns:
+            The last response; callers still call raise_for_status() on it
+
+        Raises:
+            UpstreamUnavailable: The host's circuit is open
+        """
+        return self.request('GET', url, params=params, timeout=timeout, retries=retries)
+
+    def request(self, method, url, timeout=30, retries=None, **kwargs):
+        host, (slots, breaker) = self._get_host(url)
+        if not breaker.allow():
+            raise UpstreamUnavailable(f"{host} is unavailable, retrying in up to {breaker.reset_timeout:.0f}s")
+        session = self._get_session()
+        retries = self.retries if retries is None else retries
+        try:
+            for attempt in range(retries + 1):
+                try:
+                    with slots:
+                        response = session.request(method, url, timeout=timeout, **kwargs)
+                except (http.exceptions.ConnectionError, http.exceptions.Timeout):
+                    if attempt == retries:
+                        raise
+                    time.sleep(retry_delay(attempt, self.backoff, self.max_retry_wait))
+                    continue
+                delay = None
+                if response.status_code in RETRYABLE_UPSTREAM_STATUSES and attempt < retries:
+                    delay = retry_delay(attempt, self.backoff, self.max_retry_wait, response.headers.get('Retry-After'))
+                if delay is None:
+                    break
+                time.sleep(delay)
+        except (http.exceptions.ConnectionError, http.exceptions.Timeout):
+            breaker.record_failure()
+            raise
+        except Exception:
+            breaker.release()
+            raise
+
+        if response.status_code >= 500:
+            breaker.record_failure()
+        else:
+            breaker.record_success()
+        return response
+
+    def close(self):
+        with self.lock:
+            if self.session is not None:
+                self.session.close()
+            self.session, self.session_pid = None, None
+
+
+
+class AsyncUpstreamClient:
+    """asyncio counterpart of UpstreamClient for the async serving mode
+
+    One aiohttp session per event loop keeps connections alive and caps the
+    connections to each host, so thousands of awaiting requests share a
+    bounded pool instead of each holding a thread. A per-host semaphore
+    applies the stricter UPSTREAM_HOST_LIMITS caps. Retries and the per-host
+    circuit breakers behave as in UpstreamClient.
+    """
+
+    def __init__(self, max_per_host=UPSTREAM_ASYNC_MAX_PER_HOST, retries=UPSTREAM_RETRIES, backoff=UPSTREAM_BACKOFF,
+                 breaker_threshold=UPSTREAM_BREAKER_THRESHOLD, breaker_reset=UPSTREAM_BREAKER_RESET,
+                 max_retry_wait=UPSTREAM_MAX_RETRY_WAIT):
+        self.max_per_host = max(1, max_per_host)
+        self.retries = retries
+        self.backoff = backoff
+        self.max_retry_wait = max_retry_wait
+        self.breaker_threshold = breaker_threshold
+        self.breaker_reset = breaker_reset
+        self.session = None
+        self.loop = None
+        self.breakers = {}
+        self.slots = {}
+
+    def _get_session(self):
+        loop = asyncio.get_running_loop()
+        if self.session is None or self.session.closed or self.loop is not loop:
+            connector = aiohttp.TCPConnector(limit=0, limit_per_host=self.max_per_host, ttl_dns_cache=300)
+            self.session = aiohttp.ClientSession(connector=connector)
+            self.loop = loop
+            self.slots = {}  # Semaphores belong to the loop they were created on
+        return self.session
+
+    def _host_slots(self, url):
+        host = urlsplit(url).netloc
+        if host not in self.slots:
+            self.slots[host] = asyncio.Semaphore(host_limit(host, self.max_per_host))
+        return self.slots[host]
+
+    def breaker(self, url):
+        host = urlsplit(url).netloc
+        if host not in self.breakers:
+            self.breakers[host] = CircuitBreaker(self.breaker_threshold, self.breaker_reset)
+        return self.breakers[host]
+
+    async def get_json(self, url, params=None, timeout=30, retries=None):
+        """
+        GET url and return its decoded JSON body
+
+        Raises:
+            UpstreamUnavailable: The host's circuit is open
+            aiohttp.ClientResponseError: The final response was an HTTP error
+        """
+        breaker = self.breaker(url)
+        if not breaker.allow():
+            raise UpstreamUnavailable(f"{urlsplit(url).netloc} is unavailable, retrying in up to {breaker.reset_timeout:.0f}s")
+        session = self._get_session()
+        slots = self._host_slots(url)
+        retries = self.retries if retries is None else retries
+        try:
+            for attempt in range(retries + 1):
+                try:
+                    async with slots, session.get(url, params=params, timeout=aiohttp.ClientTimeout(total=timeout)) as response:
+                        delay = None
+                        if response.status in RETRYABLE_UPSTREAM_STATUSES and attempt < retries:
+                            delay = retry_delay(attempt, self.backoff, self.max_retry_wait, response.headers.get('Retry-After'))
+                        if delay is None:
+                            if response.status >= 500:
+                                breaker.record_failure()
+                            else:
+                                breaker.record_success()
+                            response.raise_for_status()
+                            return await response.json(content_type=None)
+                except (aiohttp.ClientConnectionError, asyncio.TimeoutError):
+                    if attempt == retries:
+                        raise
+                    await asyncio.sleep(retry_delay(attempt, self.backoff, self.max_retry_wait))
+                    continue
+                await asyncio.sleep(delay)
+        except (aiohttp.ClientConnectionError, asyncio.TimeoutError):
+            breaker.record_failure()
+            raise
+        except Exception:
+            breaker.release()
+            raise
+
+    async def close(self):
+        if self.session is not None and not self.session.closed:
+            await self.session.close()
+        self.session, self.loop = None, None
+
+
+upstream_client = UpstreamClient()
+async_upstream_client = AsyncUpstreamClient()
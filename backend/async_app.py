@@ -0,0 +1,57 @@
+import os
+
+from aiohttp import web
+
+from api.controller.async_weather import async_weather_routes
+from api.services import async_upstream_client
+
+CORS_ORIGIN = "http://localhost:3000"
+
+
+@web.middleware
+async def cors_middleware(request, handler):
+    """Mirror the Flask app's CORS policy, answering preflight requests directly"""
+    if request.method == 'OPTIONS':
+        response = web.Response()
+        response.headers['Access-Control-Allow-Methods'] = 'GET, POST, OPTIONS'
+        response.headers['Access-Control-Allow-Headers'] = request.headers.get('Access-Control-Request-Headers', '*')
+    else:
+        try:
+            response = await handler(request)
+        except web.HTTPException as e:
+            # 404/405 and other raised responses need the headers too, or the browser hides their status
+            add_cors_headers(request, e)
+            raise
+    add_cors_headers(request, response)
+    return response
+
+
+def add_cors_headers(request, response):
+    if request.headers.get('Origin') == CORS_ORIGIN:
+        response.headers['Access-Control-Allow-Origin'] = CORS_ORIGIN
+        response.headers['Access-Control-Allow-Credentials'] = 'true'
+        response.headers['Vary'] = 'Origin'
+
+
+async def close_upstream(app):
+    await async_upstream_client.close()
+
+
+def create_async_app():
+    """Build the asyncio app serving the upstream-bound routes under /api
+
+    Each request only awaits the upstream call, so a single process keeps
+    thousands of them in flight. Run it next to the Flask app, e.g. behind
+    the same proxy, with ``python async_app.py``.
+    """
+    api = web.Application()
+    api.add_routes(async_weather_routes)
+
+    app = web.Application(middlewares=[cors_middleware])
+    app.add_subapp('/api', api)
+    app.on_cleanup.append(close_upstream)
+    return app
+
+
+if __name__ == '__main__':
+    web.run_app(create_async_app(), host='0.0.0.0', port=int(os.getenv('ASYNC_PORT', 5001)))
@@ -0,0 +1,48 @@
+import numpy as np
+import pytest
+
+from api.services.grid_codec import GRID_ENCODINGS, dequantize_grid, quantize_grid
+
+
+def sample_grid():
+    lat_mesh, lon_mesh = np.meshgrid(np.linspace(-90, 90, 18), np.linspace(-180, 180, 36), indexing='ij')
+    return 15 + 20 * np.cos(np.radians(lat_mesh)) + np.sin(np.radians(lon_mesh))
+
+
+@pytest.mark.parametrize('encoding', ['uint8', 'uint16'])
+def test_integer_round_trip_is_within_half_a_step(encoding):
+    values = sample_grid()
+    payload, metadata = quantize_grid(values, encoding)
+    assert len(payload) == values.size * np.dtype(GRID_ENCODINGS[encoding]['dtype']).itemsize
+    assert (metadata['height'], metadata['width']) == values.shape
+    decoded = dequantize_grid(payload, metadata)
+    assert np.abs(decoded - values).max() <= metadata['scale'] / 2 + 1e-9
+    assert decoded.min() == pytest.approx(values.min())
+    assert decoded.max() == pytest.approx(values.max())
+
+
+def test_float16_round_trip_keeps_half_precision():
+    values = sample_grid()
+    payload, metadata = quantize_grid(values, 'float16')
+    np.testing.assert_allclose(dequantize_grid(payload, metadata), values, rtol=1e-3)
+
+
+@pytest.mark.parametrize('encoding', list(GRID_ENCODINGS))
+def test_nan_round_trips_as_nodata(encoding):
+    values = sample_grid()
+    values[3, 4] = values[0, 0] = np.nan
+    payload, metadata = quantize_grid(values, encoding)
+    decoded = dequantize_grid(payload, metadata)
+    np.testing.assert_array_equal(np.isnan(decoded), np.isnan(values))
+
+
+def test_constant_and_empty_grids_decode():
+    payload, metadata = quantize_grid(np.full((2, 3), 7.5), 'uint16')
+    np.testing.assert_allclose(dequantize_grid(payload, metadata), 7.5)
+    payload, metadata = quantize_grid(np.full((2, 3), np.nan), 'uint8')
+    assert np.isnan(dequantize_grid(payload, metadata)).all()
+
+
+def test_unknown_encoding_is_rejected():
+    with pytest.raises(ValueError):
+        quantize_grid(sample_grid(), 'int32')
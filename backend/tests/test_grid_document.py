@@ -0,0 +1,57 @@
+import numpy as np
+
+from api.services.grid_document import decode_grid_document, encode_grid_document
+
+DATE, TIMESTAMP = '20250529', '2025-05-29T06:00:00+00:00'
+
+
+def regular_samples():
+    lon_mesh, lat_mesh = np.meshgrid(np.arange(-180, 181, 60.0), np.arange(-90, 91, 30.0))
+    lats, lons = lat_mesh.ravel(), lon_mesh.ravel()
+    return lats, lons, {'temperature': lats / 3 + lons / 10, 'humidity': np.full(lats.size, 55.0)}
+
+
+def test_complete_regular_grid_decodes_as_axes_and_2d_values():
+    lats, lons, columns = regular_samples()
+    order = np.random.default_rng(0).permutation(lats.size)
+    document = encode_grid_document(DATE, TIMESTAMP, lats[order], lons[order],
+                                    {name: column[order] for name, column in columns.items()})
+    assert document['grid']['kind'] == 'regular'
+    assert (document['date'], document['timestamp'], document['point_count']) == (DATE, TIMESTAMP, lats.size)
+
+    decoded = decode_grid_document(document, 'temperature')
+    np.testing.assert_array_equal(decoded['lat'], np.arange(-90, 91, 30.0))
+    np.testing.assert_array_equal(decoded['lon'], np.arange(-180, 181, 60.0))
+    lon_mesh, lat_mesh = np.meshgrid(decoded['lon'], decoded['lat'])
+    np.testing.assert_allclose(decoded['temperature'], lat_mesh / 3 + lon_mesh / 10, rtol=1e-6)
+
+
+def test_sparse_regular_grid_decodes_present_samples_only():
+    lats, lons, columns = regular_samples()
+    keep = np.arange(lats.size) % 4 != 0
+    document = encode_grid_document(DATE, TIMESTAMP, lats[keep], lons[keep], {'temperature': columns['temperature'][keep]})
+    assert document['grid']['kind'] == 'regular'
+
+    decoded = decode_grid_document(document, 'temperature')
+    assert len(decoded['temperature']) == keep.sum()
+    np.testing.assert_allclose(decoded['temperature'], decoded['lat'] / 3 + decoded['lon'] / 10, rtol=1e-6)
+
+
+def test_scattered_points_round_trip_as_columns():
+    rng = np.random.default_rng(1)
+    lats, lons = rng.uniform(-90, 90, 50), rng.uniform(-180, 180, 50)
+    values = rng.normal(20, 5, 50)
+    document = encode_grid_document(DATE, TIMESTAMP, lats, lons, {'temperature': values})
+    assert document['grid']['kind'] == 'points'
+
+    decoded = decode_grid_document(document, 'temperature')
+    np.testing.assert_allclose(decoded['lat'], lats, rtol=1e-6)
+    np.testing.assert_allclose(decoded['lon'], lons, rtol=1e-6)
+    np.testing.assert_allclose(decoded['temperature'], values, rtol=1e-6)
+
+
+def test_missing_or_empty_variable_decodes_as_none():
+    lats, lons, columns = regular_samples()
+    document = encode_grid_document(DATE, TIMESTAMP, lats, lons, {'temperature': np.full(lats.size, np.nan)})
+    assert decode_grid_document(document, 'humidity') is None
+    assert decode_grid_document(document, 'temperature') is None
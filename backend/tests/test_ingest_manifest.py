@@ -0,0 +1,63 @@
+import mongomock
+import pytest
+
+from api.mongo.ingest_manifest import IngestManifest, incrementalRanges
+
+
+@pytest.fixture
+def manifest():
+    collection = mongomock.MongoClient().db.ingest_manifest
+
+    def bulk_write(operations, ordered=True):
+        # mongomock's bulk_write does not accept the UpdateOne of current pymongo
+        for operation in operations:
+            collection.update_one(operation._filter, operation._doc, upsert=operation._upsert)
+
+    collection.bulk_write = bulk_write
+    return IngestManifest(collection)
+
+
+def test_pending_ranges_lists_planned_points_without_completed_cells(manifest):
+    manifest.planRange([(0, 0), (0, 5), (5, 5)], '20250101', '20250130')
+    manifest.planRange([(10, 10)], '20250201', '20250228')
+    manifest.markCompleted([(0, 5)], '20250101', '20250130')
+
+    assert manifest.pendingRanges() == {
+        ('20250101', '20250130'): [(0, 0), (5, 5)],
+        ('20250201', '20250228'): [(10, 10)],
+    }
+
+
+def test_completed_ranges_are_marked_done_and_skipped(manifest):
+    manifest.planRange([(0, 0), (0, 5)], '20250101', '20250130')
+    manifest.markCompleted([(0, 0), (0, 5)], '20250101', '20250130')
+
+    assert manifest.pendingRanges() == {}
+    assert manifest.collection.find_one({'_id': manifest.planId('20250101', '20250130')})['done'] is True
+
+
+def test_replanning_a_range_keeps_its_earlier_points(manifest):
+    manifest.planRange([(0, 0)], '20250101', '20250130')
+    manifest.planRange([(0, 5), (0, 0)], '20250101', '20250130')
+
+    assert sorted(manifest.plannedPoints('20250101', '20250130')) == [(0, 0), (0, 5)]
+    assert manifest.plannedPoints('20250201', '20250228') is None
+
+
+def test_plans_are_not_counted_as_completed_cells(manifest):
+    manifest.planRange([(0, 0)], '20250101', '20250130')
+    assert manifest.completedPoints('20250101', '20250130') == set()
+
+
+def test_incremental_ranges_start_each_point_at_its_newest_stored_day():
+    points = [(0, 0), (0, 5), (5, 5), (5, 10)]
+    latest = {(0, 0): '20250528', (0, 5): '20250528', (5, 5): '20250401'}
+
+    assert incrementalRanges(points, latest, '20250530', days=30) == {
+        ('20250528', '20250530'): [(0, 0), (0, 5)],
+        ('20250430', '20250530'): [(5, 5), (5, 10)],
+    }
+
+
+def test_incremental_ranges_skip_points_stored_past_the_end():
+    assert incrementalRanges([(0, 0)], {(0, 0): '20250601'}, '20250530') == {}
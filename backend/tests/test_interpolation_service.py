@@ -0,0 +1,82 @@
+import numpy as np
+from scipy.interpolate import griddata
+
+from api.services.interpolation_service import InterpolationPlan, InterpolationPlanCache, interpolate_points_to_grid
+
+
+def scattered_samples(count=200, seed=0):
+    rng = np.random.default_rng(seed)
+    lats = rng.uniform(-80, 80, count)
+    lons = rng.uniform(-170, 170, count)
+    values = np.column_stack((np.sin(np.radians(lats)) * 30, np.cos(np.radians(lons)) * 10 + lats / 9))
+    return lats, lons, values
+
+
+TARGET_LATS = np.arange(-90, 91, 10.0)
+TARGET_LONS = np.arange(-180, 181, 10.0)
+
+
+def griddata_reference(lats, lons, values, method):
+    target_lon_mesh, target_lat_mesh = np.meshgrid(TARGET_LONS, TARGET_LATS)
+    return griddata((lons, lats), values, (target_lon_mesh, target_lat_mesh), method=method)
+
+
+def test_linear_plan_matches_griddata():
+    lats, lons, values = scattered_samples()
+    plan = InterpolationPlan(lats, lons, TARGET_LATS, TARGET_LONS)
+    for column in range(values.shape[1]):
+        expected = griddata_reference(lats, lons, values[:, column], 'linear')
+        np.testing.assert_allclose(plan.linear(values[:, column]), expected, equal_nan=True)
+
+
+def test_linear_plan_interpolates_value_matrix_at_once():
+    lats, lons, values = scattered_samples()
+    plan = InterpolationPlan(lats, lons, TARGET_LATS, TARGET_LONS)
+    result = plan.linear(values, fill_value=-1.0)
+    assert result.shape == (len(TARGET_LATS), len(TARGET_LONS), 2)
+    expected = griddata_reference(lats, lons, values, 'linear')
+    np.testing.assert_allclose(result, np.where(np.isnan(expected), -1.0, expected))
+
+
+def test_cubic_plan_matches_griddata():
+    lats, lons, values = scattered_samples()
+    plan = InterpolationPlan(lats, lons, TARGET_LATS, TARGET_LONS)
+    expected = griddata_reference(lats, lons, values[:, 0], 'cubic')
+    np.testing.assert_allclose(plan.cubic(values[:, 0]), expected, equal_nan=True)
+
+
+def test_plan_cache_reuses_plans_for_the_same_layout():
+    lats, lons, _ = scattered_samples()
+    cache = InterpolationPlanCache()
+    plan = cache.get_plan(lats, lons, TARGET_LATS, TARGET_LONS)
+    assert cache.get_plan(lats.copy(), lons.copy(), TARGET_LATS, TARGET_LONS) is plan
+    assert cache.get_plan(lats[:-1], lons[:-1], TARGET_LATS, TARGET_LONS) is not plan
+
+
+def test_plan_cache_stays_within_its_byte_budget():
+    plan_bytes = InterpolationPlan(*scattered_samples()[:2], TARGET_LATS, TARGET_LONS).nbytes
+    cache = InterpolationPlanCache(max_entries=16, max_bytes=int(plan_bytes * 2.5))
+    for seed in range(5):
+        lats, lons, _ = scattered_samples(seed=seed)
+        cache.get_plan(lats, lons, TARGET_LATS, TARGET_LONS)
+        assert cache.total_bytes <= cache.max_bytes
+    assert len(cache.plans) == 2
+
+
+def test_oversized_plan_is_returned_but_not_cached():
+    lats, lons, values = scattered_samples()
+    cache = InterpolationPlanCache(max_bytes=1)
+    plan = cache.get_plan(lats, lons, TARGET_LATS, TARGET_LONS)
+    assert plan.linear(values[:, 0]).shape == (len(TARGET_LATS), len(TARGET_LONS))
+    assert not cache.plans and cache.total_bytes == 0
+
+
+def test_complete_regular_grid_takes_the_rectilinear_path():
+    lat_axis, lon_axis = np.arange(-90, 91, 30.0), np.arange(-180, 181, 60.0)
+    lon_mesh, lat_mesh = np.meshgrid(lon_axis, lat_axis)
+    values = lat_mesh.ravel() * 2 + lon_mesh.ravel()
+    order = np.random.default_rng(1).permutation(values.size)
+    result = interpolate_points_to_grid(lat_mesh.ravel()[order], lon_mesh.ravel()[order], values[order],
+                                        TARGET_LATS, TARGET_LONS)
+    target_lon_mesh, target_lat_mesh = np.meshgrid(TARGET_LONS, TARGET_LATS)
+    np.testing.assert_allclose(result, target_lat_mesh * 2 + target_lon_mesh, atol=1e-9)
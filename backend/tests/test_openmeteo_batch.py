@@ -0,0 +1,37 @@
+import inspect
+
+import openmeteo_requests
+import pytest
+
+from api.services.openmeteo_batch import chunk_locations, grid_locations, location_params, split_json_locations
+
+
+def test_grid_locations_are_row_major_and_chunked_in_order():
+    locations = grid_locations(90)
+    assert locations[:3] == [(-90, -180), (-90, -90), (-90, 0)]
+    assert len(locations) == 3 * 5
+
+    chunks = chunk_locations(locations, 4)
+    assert [len(chunk) for chunk in chunks] == [4, 4, 4, 3]
+    assert [location for chunk in chunks for location in chunk] == locations
+
+
+def test_location_params_join_coordinates_in_request_order():
+    assert location_params([(10, 20), (-5.5, 30)]) == {'latitude': '10,-5.5', 'longitude': '20,30'}
+
+
+def test_split_json_locations_pairs_results_in_request_order():
+    chunk = [(0, 0), (0, 10)]
+    assert split_json_locations(chunk, [{'a': 1}, {'a': 2}]) == [((0, 0), {'a': 1}), ((0, 10), {'a': 2})]
+    assert split_json_locations([(0, 0)], {'a': 1}) == [((0, 0), {'a': 1})]
+
+
+@pytest.mark.parametrize('payload', [[{'a': 1}], [{'a': 1}, {'a': 2}, {'a': 3}], {'a': 1}])
+def test_split_json_locations_rejects_a_wrong_result_count(payload):
+    with pytest.raises(ValueError, match='Expected 2 locations'):
+        split_json_locations([(0, 0), (0, 10)], payload)
+
+
+def test_pinned_openmeteo_client_accepts_post():
+    # The Open-Meteo ingest sends every chunk with weather_api(..., method="POST")
+    assert 'method' in inspect.signature(openmeteo_requests.Client.weather_api).parameters
@@ -0,0 +1,78 @@
+import time
+
+import pytest
+
+from api.services.upstream_client import CircuitBreaker, retry_delay
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(time, 'monotonic', lambda: now[0])
+    return now
+
+
+def test_breaker_opens_after_threshold_consecutive_failures(clock):
+    breaker = CircuitBreaker(threshold=3, reset_timeout=30)
+    for _ in range(2):
+        assert breaker.allow()
+        breaker.record_failure()
+    assert breaker.state == 'closed'
+
+    breaker.record_failure()
+    assert breaker.state == 'open'
+    assert not breaker.allow()
+
+
+def test_success_resets_the_failure_count(clock):
+    breaker = CircuitBreaker(threshold=2, reset_timeout=30)
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+    assert breaker.state == 'closed'
+
+
+def test_half_open_breaker_lets_one_probe_through(clock):
+    breaker = CircuitBreaker(threshold=1, reset_timeout=30)
+    breaker.record_failure()
+    clock[0] += 30
+    assert breaker.state == 'half-open'
+    assert breaker.allow()
+    assert not breaker.allow()
+
+
+def test_successful_probe_closes_the_circuit(clock):
+    breaker = CircuitBreaker(threshold=1, reset_timeout=30)
+    breaker.record_failure()
+    clock[0] += 30
+    breaker.allow()
+    breaker.record_success()
+    assert breaker.state == 'closed'
+    assert breaker.allow()
+
+
+def test_failed_probe_reopens_for_another_timeout(clock):
+    breaker = CircuitBreaker(threshold=5, reset_timeout=30)
+    for _ in range(5):
+        breaker.record_failure()
+    clock[0] += 30
+    breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == 'open'
+    clock[0] += 29
+    assert not breaker.allow()
+
+
+def test_released_probe_slot_can_be_claimed_again(clock):
+    breaker = CircuitBreaker(threshold=1, reset_timeout=30)
+    breaker.record_failure()
+    clock[0] += 30
+    breaker.allow()
+    breaker.release()
+    assert breaker.allow()
+
+
+def test_retry_delay_honours_retry_after_up_to_max_wait():
+    assert retry_delay(0, 0.5, 2, retry_after='1') >= 1
+    assert retry_delay(0, 0.5, 2, retry_after='60') is None
+    assert 0 <= retry_delay(10, 0.5, 2) <= 2
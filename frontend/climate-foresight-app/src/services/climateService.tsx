@@ -4,7 +4,7 @@ import countryData from '../../public/data/country_coordinates.json'
 export const getClimateData = async (): Promise<any> => {
 
     try{
-        const response = await fetch('http://localhost:5000/api/get-climate-data-parallel', {
+        const response = await fetch('http://localhost:5001/api/get-climate-data-parallel', {
             method: 'POST',
             headers: {
               'Content-Type': 'application/json',
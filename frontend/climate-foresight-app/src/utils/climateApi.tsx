@@ -30,9 +30,12 @@ export interface ClimateDataPoint {
   
   class ClimateApiService {
     private baseUrl: string
+    // Upstream-bound routes are served by the async backend (backend/async_app.py)
+    private asyncBaseUrl: string
   
-    constructor(baseUrl: string = 'http://localhost:5000/api') {
+    constructor(baseUrl: string = 'http://localhost:5000/api', asyncBaseUrl: string = 'http://localhost:5001/api') {
       this.baseUrl = baseUrl
+      this.asyncBaseUrl = asyncBaseUrl
     }
   
     async getGlobalClimateData(useSample: boolean = true): Promise<GlobalClimateResponse> {
@@ -50,7 +53,7 @@ export interface ClimateDataPoint {
   
     async getCurrentWeather(lat: number, lon: number): Promise<any> {
       try {
-        const response = await fetch(`${this.baseUrl}/weather/current/${lat}/${lon}`)
+        const response = await fetch(`${this.asyncBaseUrl}/weather/current/${lat}/${lon}`)
         if (!response.ok) {
           throw new Error(`HTTP error! status: ${response.status}`)
         }
@@ -63,7 +66,7 @@ export interface ClimateDataPoint {
   
     async getWeatherForecast(lat: number, lon: number): Promise<WeatherForecast> {
       try {
-        const response = await fetch(`${this.baseUrl}/weather/forecast/${lat}/${lon}`)
+        const response = await fetch(`${this.asyncBaseUrl}/weather/forecast/${lat}/${lon}`)
         if (!response.ok) {
           throw new Error(`HTTP error! status: ${response.status}`)
         }